@@ -10,7 +10,7 @@ from backend.db.project import Project, Chapter, Paragraph, CorrectionStatus
 from backend.utils.job import Job
 from backend.utils.job_queue import JobQueue
 from backend.utils.correction_validation import validate_corrections
-from .ollama_client import OllamaClient
+from .ollama_client import OllamaClient, DEFAULT_LOCAL_OLLAMA
 
 # TODO: investigate JSON formatted responses
 
@@ -93,8 +93,26 @@ class AIManager:
         self.model = "deepseek-r1:32b"
         self.custom_ollama = None
         self._generating_all = False
+
+        # Ids of projects and chapters that background generation is currently running for. Used to skip duplicate
+        # requests (for example from double clicks) that would otherwise redo the same AI work.
+        self._generating_summaries_for: set[int] = set()
+        self._generating_corrections_for_projects: set[int] = set()
+        self._generating_corrections_for_chapters: set[int] = set()
+
         self.job_queue = JobQueue()
 
+        # Reused as long as the ollama settings stay the same, so that it can keep its connections open
+        self._client: OllamaClient | None = None
+
+    async def aclose(self):
+        """
+        Closes the connections to ollama. Meant to be called on shutdown.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     def configure_model(self, model: str):
         self.model = model
         print("Changed active model to: ", model)
@@ -115,17 +133,26 @@ class AIManager:
         return task
 
     async def generate_summaries(self, project: Project, database: Database):
-        for chapter in project.chapters:
-            if chapter.summary:
-                continue
+        if project.id in self._generating_summaries_for:
+            print(f"Already generating summaries for project {project.id}, skipping...")
+            return
 
-            print("Generating missing summary for chapter:", chapter.name)
+        self._generating_summaries_for.add(project.id)
 
-            paragraphs = await database.get_chapter_paragraph_text(chapter.id)
+        try:
+            for chapter in project.chapters:
+                if chapter.summary:
+                    continue
 
-            await self._generate_summary(chapter, paragraphs)
+                print("Generating missing summary for chapter:", chapter.name)
 
-            await database.update_chapter(chapter)
+                paragraphs = await database.get_chapter_paragraph_text(chapter.id)
+
+                await self._generate_summary(chapter, paragraphs)
+
+                await database.update_chapter(chapter)
+        finally:
+            self._generating_summaries_for.discard(project.id)
 
     async def generate_single_summary(self, chapter: Chapter):
         """
@@ -168,59 +195,77 @@ class AIManager:
         if not project.chapters:
             raise Exception("Cannot generate corrections for project with no chapters")
 
+        if project.id in self._generating_corrections_for_projects:
+            print(f"Already generating corrections for project {project.id}, skipping...")
+            return
+
+        self._generating_corrections_for_projects.add(project.id)
+
         print("Generating corrections for project:", project.name)
 
-        for i, chapter in enumerate(project.chapters):
-            try:
-                # This doesn't require a recursively fetched project, so we need to fetch the chapters here again
-                fully_loaded_chapter = await database.get_chapter(chapter.id, True)
+        try:
+            for i, chapter in enumerate(project.chapters):
+                try:
+                    # This doesn't require a recursively fetched project, so we need to fetch the chapters here again
+                    fully_loaded_chapter = await database.get_chapter(chapter.id, True)
 
-                await self.generate_corrections(fully_loaded_chapter, database, project.correctionStrengthLevel)
-                print("Chapter", i + 1, "of", len(project.chapters), "done.")
-            except Exception as e:
-                print("Error generating corrections for chapter:", chapter.name, "with error:", e)
-                continue
+                    await self.generate_corrections(fully_loaded_chapter, database, project.correctionStrengthLevel)
+                    print("Chapter", i + 1, "of", len(project.chapters), "done.")
+                except Exception as e:
+                    print("Error generating corrections for chapter:", chapter.name, "with error:", e)
+                    continue
+        finally:
+            self._generating_corrections_for_projects.discard(project.id)
 
     async def generate_corrections(self, chapter: Chapter, database: Database, correction_strength: int):
         if not chapter.paragraphs:
             raise Exception("Cannot generate corrections for chapter with no paragraphs")
 
-        # If another chapter is processing at the same time the timing is a bit unreliable
-        start = time.time()
+        if chapter.id in self._generating_corrections_for_chapters:
+            print(f"Already generating corrections for chapter {chapter.chapterIndex}, skipping:", chapter.name)
+            return
+
+        self._generating_corrections_for_chapters.add(chapter.id)
 
-        config = await database.get_config()
+        try:
+            # If another chapter is processing at the same time the timing is a bit unreliable
+            start = time.time()
 
-        paragraphs_to_correct = [paragraph for paragraph in chapter.paragraphs if
-                                 paragraph.correctionStatus == CorrectionStatus.notGenerated]
+            config = await database.get_config()
 
-        if len(paragraphs_to_correct) < 1:
-            print(f"No paragraphs to correct, skipping chapter {chapter.chapterIndex}:", chapter.name)
-            return
+            paragraphs_to_correct = [paragraph for paragraph in chapter.paragraphs if
+                                     paragraph.correctionStatus == CorrectionStatus.notGenerated]
 
-        print(f"Generating corrections for chapter {chapter.chapterIndex}:", chapter.name)
+            if len(paragraphs_to_correct) < 1:
+                print(f"No paragraphs to correct, skipping chapter {chapter.chapterIndex}:", chapter.name)
+                return
 
-        work_to_do = chunked_paragraphs(paragraphs_to_correct, config.simultaneousCorrectionSize)
+            print(f"Generating corrections for chapter {chapter.chapterIndex}:", chapter.name)
 
-        for i, group in enumerate(work_to_do):
+            work_to_do = chunked_paragraphs(paragraphs_to_correct, config.simultaneousCorrectionSize)
 
-            print("Correcting paragraph group with size:", len(group), "and total character count:", sum(
-                [len(paragraph.originalText) for paragraph in group]))
+            for i, group in enumerate(work_to_do):
 
-            try:
-                await self._generate_correction(group, chapter.chapterIndex, correction_strength,
-                                                config.correctionReRuns)
-                print(f"Done correcting {(i + 1) / len(work_to_do) * 100:.2f}% of chapter {chapter.chapterIndex}")
-            except Exception as e:
-                print("Error generating correction for group with error:", e)
-                print("Ignoring this group and continuing with the rest of the chapter...")
-                continue
+                print("Correcting paragraph group with size:", len(group), "and total character count:", sum(
+                    [len(paragraph.originalText) for paragraph in group]))
 
-            for paragraph in group:
-                await database.update_paragraph(paragraph)
+                try:
+                    await self._generate_correction(group, chapter.chapterIndex, correction_strength,
+                                                    config.correctionReRuns)
+                    print(f"Done correcting {(i + 1) / len(work_to_do) * 100:.2f}% of chapter {chapter.chapterIndex}")
+                except Exception as e:
+                    print("Error generating correction for group with error:", e)
+                    print("Ignoring this group and continuing with the rest of the chapter...")
+                    continue
+
+                for paragraph in group:
+                    await database.update_paragraph(paragraph)
 
-        duration = time.time() - start
-        if duration > 10:
-            print("Generated corrections for chapter:", chapter.name, "in:", round(duration / 60, 1), "minutes")
+            duration = time.time() - start
+            if duration > 10:
+                print("Generated corrections for chapter:", chapter.name, "in:", round(duration / 60, 1), "minutes")
+        finally:
+            self._generating_corrections_for_chapters.discard(chapter.id)
 
     async def generate_single_correction(self, paragraph: Paragraph, contained_in_chapter: Chapter,
                                          correction_strength: int, re_runs: int):
@@ -415,7 +460,19 @@ class AIManager:
         self.currently_running = False
 
     def _get_client(self):
-        return OllamaClient(self.custom_ollama, unload_delay=self.unload_delay)
+        client = self._client
+
+        if client is None or client.unload_delay != self.unload_delay or client.base_url != (
+                self.custom_ollama or DEFAULT_LOCAL_OLLAMA):
+            # Only the blocking requests are used from the job queue thread, so the old client has no async
+            # connections open and can be closed right here
+            if client is not None:
+                client.close()
+
+            client = OllamaClient(self.custom_ollama, unload_delay=self.unload_delay)
+            self._client = client
+
+        return client
 
 
 def extract_corrections(paragraph_bundle: List[Paragraph], response: str) -> List[str]:
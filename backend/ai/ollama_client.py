@@ -1,5 +1,6 @@
 from typing import Dict, Any
 
+import httpx
 import requests
 
 # How long at most to allow *any* ollama API request to run (nothing is allowed to take longer, even if it might
@@ -31,6 +32,12 @@ class OllamaClient:
 
         self.unload_delay = unload_delay
 
+        # A session keeps the HTTP connections to ollama alive between requests
+        self._session = requests.Session()
+
+        # Used by the async methods, created on first use as most clients only run the blocking requests
+        self._async_client: httpx.AsyncClient | None = None
+
     def submit_chat_message(self, model: str, message: str, extra_options: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Sends a message to a specific model in the Ollama API and retrieves the response in a chat format.
@@ -56,7 +63,7 @@ class OllamaClient:
         self._add_keep_alive(payload)
 
         try:
-            response = requests.post(url, json=payload, timeout=MAX_API_TIME)
+            response = self._session.post(url, json=payload, timeout=MAX_API_TIME)
             response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
             return response.json()
         except requests.RequestException as e:
@@ -92,7 +99,7 @@ class OllamaClient:
         self._add_keep_alive(payload)
 
         try:
-            response = requests.post(url, json=payload, timeout=MAX_API_TIME)
+            response = self._session.post(url, json=payload, timeout=MAX_API_TIME)
             response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
             return response.json()
         except requests.RequestException as e:
@@ -121,7 +128,7 @@ class OllamaClient:
         self._add_keep_alive(payload)
 
         try:
-            response = requests.post(url, json=payload, timeout=MAX_API_TIME)
+            response = self._session.post(url, json=payload, timeout=MAX_API_TIME)
             response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
             return response.json()  # Return the parsed JSON response
         except requests.RequestException as e:
@@ -141,14 +148,14 @@ class OllamaClient:
         url = f"{self.base_url}/api/models/{model}"
 
         try:
-            response = requests.get(url, timeout=45)
+            response = self._session.get(url, timeout=45)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
             print(f"An error occurred while fetching the model metadata: {e}")
             return {"error": str(e)}
 
-    def list_available_models(self) -> list[Any]:
+    async def list_available_models(self) -> list[Any]:
         """
         Retrieves a list of all available models from the Ollama API.
 
@@ -158,7 +165,7 @@ class OllamaClient:
         url = f"{self.base_url}/api/tags"
 
         try:
-            response = requests.get(url, timeout=45)
+            response = await self._get_async_client().get(url, timeout=45)
             response.raise_for_status()
             raw_response = response.json()
 
@@ -166,11 +173,11 @@ class OllamaClient:
 
             return sorted(models, key=lambda model: model["name"])
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"An error occurred while retrieving the model list: {e}")
             raise
 
-    def list_loaded(self) -> Dict[str, Any]:
+    async def list_loaded(self) -> Dict[str, Any]:
         """
         Retrieves a list of loaded models
 
@@ -180,14 +187,14 @@ class OllamaClient:
         url = f"{self.base_url}/api/ps"
 
         try:
-            response = requests.get(url, timeout=45)
+            response = await self._get_async_client().get(url, timeout=45)
             response.raise_for_status()
             return response.json()
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"An error occurred while retrieving the active model list: {e}")
             return {"error": str(e)}
 
-    def get_version(self) -> str:
+    async def get_version(self) -> str:
         """
             Retrieves the version of the Ollama API.
 
@@ -197,11 +204,11 @@ class OllamaClient:
         url = f"{self.base_url}/api/version"
 
         try:
-            response = requests.get(url, timeout=30)
+            response = await self._get_async_client().get(url, timeout=30)
             response.raise_for_status()  # Raise an error for 4xx or 5xx responses
             version_data = response.json()  # Parse the response as JSON
             return version_data.get("version", "Unknown version")  # Safely extract the version
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"An error occurred while retrieving the version: {e}")
             return "Error retrieving version"
 
@@ -219,7 +226,7 @@ class OllamaClient:
         }
 
         try:
-            response = requests.post(url, json=payload, timeout=MAX_API_TIME)
+            response = self._session.post(url, json=payload, timeout=MAX_API_TIME)
             print(response.content().decode("utf-8"))
             response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
             return response.json()["status"] == "success"  # Return the parsed JSON response
@@ -228,6 +235,29 @@ class OllamaClient:
             print("Failed to pull model: ", model)
             return False
 
+    def close(self):
+        """
+        Closes the connections used by the blocking methods. The async client can only be closed from its event loop,
+        so clients that have used the async methods need aclose instead.
+        """
+        self._session.close()
+
+    async def aclose(self):
+        """
+        Closes all the connections used by this client
+        """
+        self.close()
+
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient()
+
+        return self._async_client
+
     def _add_keep_alive(self, payload: Dict[str, Any]):
         if self.unload_delay is not None:
             payload["keep_alive"] = f"{self.unload_delay}s"
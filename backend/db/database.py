@@ -1,8 +1,9 @@
 import asyncio
 import os
 import platform
-import time
 from asyncio import Lock
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import List
 
@@ -14,6 +15,121 @@ from .project import Project, Chapter, Paragraph, CorrectionStatus
 
 DATABASE_VERSION = 5
 
+# The app uses a fixed set of statements, so keep all of them prepared instead of using the small default cache
+STATEMENT_CACHE_SIZE = 256
+
+# Each chapter row takes 4 variables, this keeps a single insert within SQLite's default limit of 999 variables
+CHAPTER_INSERT_BATCH_SIZE = 200
+
+# How many projects' chapter name to ID mappings to keep cached
+CHAPTER_ID_CACHE_SIZE = 32
+
+# How many single chapter / paragraph rows to keep cached for the repeated lookups done by the correction jobs
+CHAPTER_ROW_CACHE_SIZE = 256
+PARAGRAPH_ROW_CACHE_SIZE = 2048
+
+# Number of read-only connections, WAL mode allows these to run concurrently with the single writer
+READER_CONNECTION_COUNT = 4
+
+# Shared by all code paths that add paragraphs so that the column list and the values cannot get out of sync.
+# Paragraphs are inserted with multi-row statements, each row takes the placeholders of PARAGRAPH_INSERT_ROW_SQL.
+PARAGRAPH_INSERT_PREFIX_SQL = """
+    INSERT INTO paragraphs (
+        chapterId, paragraphIndex, originalText,
+        correctedText, manuallyCorrectedText, leadingSpace, correctionStatus
+    )
+    VALUES """
+PARAGRAPH_INSERT_ROW_SQL = "(?, ?, ?, ?, ?, ?, ?)"
+
+# Keeps a single paragraph insert within SQLite's default limit of 999 variables
+PARAGRAPH_INSERT_BATCH_SIZE = 999 // PARAGRAPH_INSERT_ROW_SQL.count("?")
+
+# Statement for a full batch, built once so that it stays in the statement cache
+PARAGRAPH_INSERT_BATCH_SQL = PARAGRAPH_INSERT_PREFIX_SQL + ", ".join(
+    [PARAGRAPH_INSERT_ROW_SQL] * PARAGRAPH_INSERT_BATCH_SIZE)
+
+# Replaces everything about a paragraph, used when the original text has changed
+PARAGRAPH_TEXT_UPDATE_SQL = """
+    UPDATE paragraphs
+    SET originalText = ?, correctedText = ?, manuallyCorrectedText = ?, correctionStatus = ?, leadingSpace = ?
+    WHERE chapterId = ? AND paragraphIndex = ?
+    """
+
+# Updates everything about a paragraph except the original text
+PARAGRAPH_UPDATE_SQL = """
+    UPDATE paragraphs
+    SET correctedText = ?, manuallyCorrectedText = ?, correctionStatus = ?, leadingSpace = ?
+    WHERE chapterId = ? AND paragraphIndex = ?
+    """
+
+PARAGRAPH_STATUS_UPDATE_SQL = """
+    UPDATE paragraphs
+    SET correctionStatus = ?
+    WHERE chapterId = ? AND paragraphIndex = ?
+    """
+
+PARAGRAPH_CLEAR_SQL = f"""
+    UPDATE paragraphs
+    SET correctedText = NULL, manuallyCorrectedText = NULL, correctionStatus = {CorrectionStatus.notGenerated.value}
+    WHERE chapterId = ? AND paragraphIndex = ?
+    """
+
+# Paragraphs in any other state need the user to do something
+NO_ACTION_NEEDED_STATUSES = (CorrectionStatus.notRequired, CorrectionStatus.accepted, CorrectionStatus.rejected)
+
+# The values are fixed integers so this is safe to embed, and they need to be literals (not bound parameters) for
+# SQLite to use the partial index made with this. The order must not change as SQLite only matches the index to
+# queries with the same expression as in the already created index.
+NEEDING_ACTION_FILTER_SQL = "correctionStatus NOT IN ({})".format(", ".join(
+    str(status.value) for status in NO_ACTION_NEEDED_STATUSES))
+
+# Built once here so that the exact same statement text is used on each call and stays in the statement cache
+PARAGRAPHS_NEEDING_ACTION_SQL = f"""
+    SELECT paragraphIndex
+    FROM paragraphs
+    WHERE chapterId = ? AND {NEEDING_ACTION_FILTER_SQL}
+    ORDER BY paragraphIndex ASC
+    """
+
+# Finds the closest paragraph needing action after (or before) the given one. Past the end the last (or first)
+# paragraph needing action is returned instead. Both parts are single lookups in the partial index.
+NEXT_PARAGRAPH_NEEDING_ACTION_SQL = f"""
+    SELECT COALESCE(
+        (SELECT paragraphIndex FROM paragraphs
+         WHERE chapterId = ? AND {NEEDING_ACTION_FILTER_SQL} AND paragraphIndex > ?
+         ORDER BY paragraphIndex ASC LIMIT 1),
+        (SELECT paragraphIndex FROM paragraphs
+         WHERE chapterId = ? AND {NEEDING_ACTION_FILTER_SQL}
+         ORDER BY paragraphIndex DESC LIMIT 1))
+    """
+
+PREVIOUS_PARAGRAPH_NEEDING_ACTION_SQL = f"""
+    SELECT COALESCE(
+        (SELECT paragraphIndex FROM paragraphs
+         WHERE chapterId = ? AND {NEEDING_ACTION_FILTER_SQL} AND paragraphIndex < ?
+         ORDER BY paragraphIndex DESC LIMIT 1),
+        (SELECT paragraphIndex FROM paragraphs
+         WHERE chapterId = ? AND {NEEDING_ACTION_FILTER_SQL}
+         ORDER BY paragraphIndex ASC LIMIT 1))
+    """
+
+
+def _paragraph_insert_params(chapter_id: int, paragraph_index: int, paragraph: Paragraph) -> tuple:
+    params = (
+        chapter_id,
+        paragraph_index,
+        paragraph.originalText,
+        paragraph.correctedText,
+        paragraph.manuallyCorrectedText,
+        paragraph.leadingSpace,
+        paragraph.correctionStatus,
+    )
+
+    # Only checked in debug mode, catches placeholder count mistakes early
+    assert PARAGRAPH_INSERT_ROW_SQL.count("?") == len(params)
+
+    return params
+
 
 def get_db_path() -> Path:
     """
@@ -50,9 +166,9 @@ class Database:
     _instance = None  # Singleton instance
     _lock: Lock = Lock()  # Thread-safe lock for async operations
 
-    _config_cache = None  # Cached configuration data
-    _config_cache_timestamp = None  # Timestamp of when the cache was last updated
-    _CACHE_TTL = 5  # Time to live for cache (in seconds)
+    # Cached configuration data. All changes go through update_config which refreshes this, so once loaded the
+    # config is not read from the database again.
+    _config_cache = None
 
     # TODO: figure out why it seems like this method runs twice from the singleton instance, does the rvunicorn run
     # multiple instances of the app?
@@ -69,22 +185,28 @@ class Database:
         # Ensure the folder exists
         self.db_folder.mkdir(parents=True, exist_ok=True)
 
-        # Connection pool (aiosqlite)
+        # Connection pool (aiosqlite), one writer connection and a few read-only ones
         self._connection = None
+        self._read_pool: asyncio.Queue[Connection] = asyncio.Queue()
+
+        # Chapter name to ID mappings per project, least recently used project is dropped first
+        self._chapter_id_cache: OrderedDict[int, dict[str, int]] = OrderedDict()
 
-        # Run the async initialization function
-        # We are already in an async context so we do it like this and hopefully this is initialized before any API
-        # calls are allowed through
-        asyncio.create_task(self.initialize())
+        # Raw row values of single chapters and paragraphs. Rows are cached instead of the objects as callers modify
+        # the returned objects. The generation is bumped on every invalidation so that a read that was started before
+        # a write doesn't put the old data back in the cache.
+        self._chapter_row_cache: OrderedDict[int, tuple] = OrderedDict()
+        self._paragraph_row_cache: OrderedDict[tuple[int, int], tuple] = OrderedDict()
+        self._row_cache_generation = 0
 
     async def initialize(self):
-        """Initialize the database and ensure tables exist."""
+        """
+        Initialize the database and ensure tables exist. Needs to be awaited (on app startup) before the database
+        can be used.
+        """
         async with self._lock:
-            # TODO: more entries in the pool than just one...
-            self._connection = await aiosqlite.connect(self.db_file)
+            self._connection = await self._open_connection()
             db = self._connection
-            await db.execute("PRAGMA journal_mode=WAL;")  # Enable Write-Ahead Logging (WAL)
-            db.row_factory = aiosqlite.Row  # Return dictionary-like rows
 
             await Database._create_default_tables_if_missing(db)
 
@@ -123,8 +245,27 @@ class Database:
                     await self._migrate_database(db, config)
 
             await db.commit()
+
+            await Database._create_indexes_if_missing(db)
+
+            # Readers are opened only once the tables are ready, anything wanting to read waits until then
+            for _ in range(READER_CONNECTION_COUNT):
+                self._read_pool.put_nowait(await self._open_connection(read_only=True))
+
             print("Database loaded by PID: " + str(os.getpid()))
 
+    async def close(self):
+        """Closes all database connections, for use on app shutdown."""
+        async with self._lock:
+            while not self._read_pool.empty():
+                await self._read_pool.get_nowait().close()
+
+            if self._connection is not None:
+                # Leave an empty WAL file behind
+                await self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+                await self._connection.close()
+                self._connection = None
+
     async def create_project(self, project: Project) -> int:
         """
         Writes a new project (along with its chapters and paragraphs) into the database.
@@ -149,11 +290,11 @@ class Database:
                 project_id = project_cursor.lastrowid
 
                 # Insert each Chapter and its Paragraphs.
-                for chapter in project.chapters:
-                    await self._insert_chapter(connection, chapter, project_id)
+                await self._insert_chapters(connection, project.chapters, project_id)
 
                 # Commit the transaction if all inserts succeed.
                 await connection.commit()
+                self._chapter_id_cache.pop(project_id, None)
 
             except aiosqlite.IntegrityError as e:
                 # Rollback in case a unique constraint is violated (e.g., duplicate project name)
@@ -182,92 +323,103 @@ class Database:
             try:
                 await connection.execute("BEGIN")
 
+                # Everything needed for comparing against the new text is fetched up front with a single query
+                chapter_ids = {}
+                existing_paragraphs = {}
+
+                async with connection.execute(
+                        """
+                        SELECT c.id, c.name, p.paragraphIndex, p.originalText, p.leadingSpace, p.correctedText,
+                               p.manuallyCorrectedText, p.correctionStatus
+                        FROM chapters c
+                        LEFT JOIN paragraphs p ON p.chapterId = c.id
+                        WHERE c.projectId = ?
+                        ORDER BY c.id, p.paragraphIndex ASC
+                        """,
+                        (project.id,),
+                ) as existing_cursor:
+                    for row in await existing_cursor.fetchall():
+                        chapter_id = row["id"]
+
+                        if chapter_id not in existing_paragraphs:
+                            existing_paragraphs[chapter_id] = []
+                            # In case of duplicate names, the first chapter wins
+                            chapter_ids.setdefault(row["name"], chapter_id)
+
+                        # Chapters without any paragraphs get one row of NULLs from the join
+                        if row["paragraphIndex"] is not None:
+                            existing_paragraphs[chapter_id].append(row)
+
+                chapters_to_insert = []
+                paragraph_inserts = []
+                paragraph_updates = []
+
                 for chapter in new_chapters:
-                    chapter_id = await self.get_chapter_id_by_name(chapter.name, project.id)
+                    chapter_id = chapter_ids.get(chapter.name)
 
                     if chapter_id is None:
                         # Inserting an entirely new chapter
                         print(f"Inserting new chapter to project {project.id} with name: {chapter.name}")
-                        await self._insert_chapter(connection, chapter, project.id)
-                    else:
-                        # Updating a chapter. Check if the paragraphs are fine
-                        database_chapter = await self.get_chapter(chapter_id, include_paragraphs=True)
+                        chapters_to_insert.append(chapter)
+                        continue
+
+                    # Updating a chapter. Check if the paragraphs are fine
+                    database_paragraphs = existing_paragraphs[chapter_id]
+
+                    for i, paragraph in enumerate(chapter.paragraphs):
 
-                        for i, paragraph in enumerate(chapter.paragraphs):
+                        paragraph_index = i + 1
 
-                            paragraph_index = i + 1
+                        if paragraph_index > len(database_paragraphs):
+                            # Adding new paragraphs
+                            print(
+                                f"Adding new paragraph {paragraph_index} to chapter {chapter.name} in project {project.id}")
+                            paragraph_inserts.append(_paragraph_insert_params(chapter_id, paragraph_index, paragraph))
+                        else:
+                            # See if text is right and update it if not
+                            database_paragraph = database_paragraphs[i]
 
-                            if paragraph_index > len(database_chapter.paragraphs):
-                                # Adding new paragraphs
+                            if database_paragraph["originalText"] != paragraph.originalText:
                                 print(
-                                    f"Adding new paragraph {paragraph_index} to chapter {chapter.name} in project {project.id}")
-                                await connection.execute(
-                                    """
-                                    INSERT INTO paragraphs (
-                                        chapterId, paragraphIndex, originalText,
-                                        correctedText, manuallyCorrectedText, leadingSpace, correctionStatus,
-                                    )
-                                    VALUES (?, ?, ?, ?, ?, ?)
-                                    """,
-                                    (
-                                        chapter_id,
-                                        paragraph_index,
-                                        paragraph.originalText,
-                                        paragraph.correctedText,
-                                        paragraph.manuallyCorrectedText,
-                                        paragraph.leadingSpace,
-                                        paragraph.correctionStatus,
-                                    )
-                                )
-                            else:
-                                # See if text is right and update it if not
-                                database_paragraph = database_chapter.paragraphs[i]
-
-                                if database_paragraph.originalText != paragraph.originalText:
-                                    print(
-                                        f"New text for paragraph {paragraph_index} in chapter {chapter.chapterIndex}, "
-                                        f"{chapter.name} in project {project.id}, resetting correction status")
-                                    result = await connection.execute(
-                                        """
-                                        UPDATE paragraphs
-                                        SET originalText = ?, correctedText = ?, manuallyCorrectedText = ?, 
-                                            correctionStatus = ?, leadingSpace = ?
-                                        WHERE chapterId = ? AND paragraphIndex = ?
-                                        """,
-                                        (paragraph.originalText,
-                                         paragraph.correctedText, paragraph.manuallyCorrectedText,
-                                         paragraph.correctionStatus, paragraph.leadingSpace,
-                                         database_paragraph.partOfChapter, database_paragraph.index)
-                                    )
-                                    if result.rowcount == 0:
-                                        raise ValueError(
-                                            f"Failed to upgrade paragraph "
-                                            f"{database_paragraph.partOfChapter}-{database_paragraph.index}")
-
-                                elif database_paragraph.leadingSpace != paragraph.leadingSpace:
-                                    # Update just this property
-                                    result = await connection.execute(
-                                        """
-                                        UPDATE paragraphs
-                                        SET leadingSpace = ?
-                                        WHERE chapterId = ? AND paragraphIndex = ?
-                                        """,
-                                        (paragraph.leadingSpace, database_paragraph.partOfChapter,
-                                         database_paragraph.index)
-                                    )
-                                    if result.rowcount == 0:
-                                        raise ValueError(
-                                            f"Failed to upgrade paragraph "
-                                            f"{database_paragraph.partOfChapter}-{database_paragraph.index}")
+                                    f"New text for paragraph {paragraph_index} in chapter {chapter.chapterIndex}, "
+                                    f"{chapter.name} in project {project.id}, resetting correction status")
+                                paragraph_updates.append(
+                                    (paragraph.originalText,
+                                     paragraph.correctedText, paragraph.manuallyCorrectedText,
+                                     paragraph.correctionStatus, paragraph.leadingSpace,
+                                     chapter_id, database_paragraph["paragraphIndex"]))
+
+                            elif database_paragraph["leadingSpace"] != paragraph.leadingSpace:
+                                # Update just this property, the same statement is used by keeping the other values
+                                paragraph_updates.append(
+                                    (database_paragraph["originalText"],
+                                     database_paragraph["correctedText"], database_paragraph["manuallyCorrectedText"],
+                                     database_paragraph["correctionStatus"], paragraph.leadingSpace,
+                                     chapter_id, database_paragraph["paragraphIndex"]))
+
+                if chapters_to_insert:
+                    await self._insert_chapters(connection, chapters_to_insert, project.id)
+
+                if paragraph_inserts:
+                    await self._insert_paragraph_rows(connection, paragraph_inserts)
+
+                if paragraph_updates:
+                    result = await connection.executemany(PARAGRAPH_TEXT_UPDATE_SQL, paragraph_updates)
+                    if result.rowcount != len(paragraph_updates):
+                        raise ValueError(
+                            f"Failed to upgrade {len(paragraph_updates) - result.rowcount} paragraph(s)")
 
                 # Commit the transaction if all inserts succeed.
                 await connection.commit()
+                self._chapter_id_cache.pop(project.id, None)
+                if paragraph_updates:
+                    self._invalidate_paragraph_rows()
 
             except Exception as e:
                 await connection.rollback()
                 raise RuntimeError("Failed to write project text updates to the database.") from e
 
-    async def get_project(self, project_id: int, include_chapters=True) -> Project | None:
+    async def get_project(self, project_id: int, include_chapters=True, include_paragraphs=False) -> Project | None:
         """
         Fetches the primary data for a project, along with all associated chapters,
         but excludes the paragraphs to optimize data retrieval. Uses async operations.
@@ -275,46 +427,30 @@ class Database:
         Args:
             project_id (int): The ID of the project to retrieve.
             include_chapters (bool): If True, retrieves all chapters. If False, only retrieves the project table data.
+            include_paragraphs (bool): If True, also retrieves the paragraphs of all the chapters. All paragraphs are
+                                       loaded with one query, which is much faster than fetching each chapter
+                                       separately.
 
         Returns:
             Project | None: The project data, or None if no project is found.
         """
-        connection = self._connection
-
         try:
-            # Fetch the primary project data
-            async with connection.execute(
-                    """
-                SELECT id, name, correctionStrengthLevel, stylePrompt
-                FROM projects
-                WHERE id = ?
-                """,
-                    (project_id,),
-            ) as project_cursor:
-                project_data = await project_cursor.fetchone()
+            if include_paragraphs:
+                project_data, chapters = await asyncio.gather(self._fetch_project_row(project_id),
+                                                              self._fetch_project_chapters_with_paragraphs(project_id))
+
+            elif include_chapters:
+                # These don't depend on each other so they can run at the same time on separate reader connections
+                project_data, chapters = await asyncio.gather(self._fetch_project_row(project_id),
+                                                              self._fetch_project_chapters(project_id))
+            else:
+                project_data = await self._fetch_project_row(project_id)
+                chapters = []
 
             # If no project data is found, return None
             if not project_data:
                 return None
 
-            if include_chapters:
-                # Fetch all associated chapters for the project
-                async with connection.execute(
-                        """
-                    SELECT id, name, chapterIndex, summary
-                    FROM chapters
-                    WHERE projectId = ?
-                    ORDER BY chapterIndex ASC
-                    """,
-                        (project_id,),
-                ) as chapters_cursor:
-                    chapters = [
-                        Chapter(id=row[0], projectId=project_id, name=row[1], chapterIndex=row[2], summary=row[3],
-                                paragraphs=[]) async for row in chapters_cursor
-                    ]
-            else:
-                chapters = []
-
             project = Project(id=project_data[0], name=project_data[1], correctionStrengthLevel=project_data[2],
                               stylePrompt=project_data[3], chapters=chapters)
 
@@ -335,27 +471,26 @@ class Database:
         Returns:
             Project | None: The project data, or None if no project is found.
         """
-        connection = self._connection
-
         try:
-            async with connection.execute(
-                    """
-                SELECT id, name, correctionStrengthLevel, stylePrompt
-                FROM projects
-                WHERE id = (SELECT projectId FROM chapters WHERE id = ?)
-                """,
-                    (chapter_id,),
-            ) as project_cursor:
-                project_data = await project_cursor.fetchone()
+            async with self._acquire_reader() as connection:
+                async with connection.execute(
+                        """
+                    SELECT id, name, correctionStrengthLevel, stylePrompt
+                    FROM projects
+                    WHERE id = (SELECT projectId FROM chapters WHERE id = ?)
+                    """,
+                        (chapter_id,),
+                ) as project_cursor:
+                    project_data = await project_cursor.fetchone()
 
-            # If no project data is found, return None
-            if not project_data:
-                return None
+                # If no project data is found, return None
+                if not project_data:
+                    return None
 
-            project = Project(id=project_data[0], name=project_data[1], correctionStrengthLevel=project_data[2],
-                              stylePrompt=project_data[3], chapters=[])
+                project = Project(id=project_data[0], name=project_data[1], correctionStrengthLevel=project_data[2],
+                                  stylePrompt=project_data[3], chapters=[])
 
-            return project
+                return project
 
         except Exception as e:
             # Handle and log database errors (optional logging)
@@ -370,28 +505,29 @@ class Database:
         Returns:
             List[Project]: A list of Project objects, or an empty list if no projects are found.
         """
-        connection = self._connection
-
         try:
-            # Fetch all projects
-            async with connection.execute(
-                    """
-                    SELECT id, name, correctionStrengthLevel
-                    FROM projects
-                    ORDER BY name ASC
-                    """
-            ) as projects_cursor:
-                projects = [
-                    Project(
-                        id=row["id"],
-                        name=row["name"],
-                        correctionStrengthLevel=row["correctionStrengthLevel"],
-                        stylePrompt="not fetched",
-                        chapters=[]
-                    ) async for row in projects_cursor
-                ]
-
-            return projects
+            async with self._acquire_reader() as connection:
+                # Fetch all projects
+                async with connection.execute(
+                        """
+                        SELECT id, name, correctionStrengthLevel
+                        FROM projects
+                        ORDER BY name ASC
+                        """
+                ) as projects_cursor:
+                    # Plain tuples are cheaper to build than Row objects for bigger result sets
+                    projects_cursor.row_factory = None
+                    projects = [
+                        Project(
+                            id=project_id,
+                            name=name,
+                            correctionStrengthLevel=correction_strength_level,
+                            stylePrompt="not fetched",
+                            chapters=[]
+                        ) for project_id, name, correction_strength_level in await projects_cursor.fetchall()
+                    ]
+
+                return projects
 
         except Exception as e:
             # Handle and log database errors (optional logging)
@@ -409,58 +545,67 @@ class Database:
         Returns:
             Chapter | None: The chapter data, or None if not found.
         """
-        connection = self._connection
-
-        try:
-            # Fetch the main chapter data
-            async with connection.execute(
-                    """
-                    SELECT id, name, chapterIndex, summary, projectId
-                    FROM chapters
-                    WHERE id = ?
-                    """,
-                    (chapter_id,),
-            ) as chapter_cursor:
-                chapter_data = await chapter_cursor.fetchone()
+        chapter_data = self._chapter_row_cache.get(chapter_id)
+        if chapter_data is not None:
+            self._chapter_row_cache.move_to_end(chapter_id)
 
-            # If no chapter is found, return None
-            if not chapter_data:
-                return None
-
-            # Create the Chapter object
-            chapter = Chapter(
-                id=chapter_data["id"],
-                name=chapter_data["name"],
-                chapterIndex=chapter_data["chapterIndex"],
-                summary=chapter_data["summary"],
-                projectId=chapter_data["projectId"],
-                paragraphs=[],
-            )
+            if not include_paragraphs:
+                return self._chapter_from_row(chapter_data)
 
-            # If requested, fetch all associated paragraphs
-            if include_paragraphs:
-                async with connection.execute(
-                        """
-                        SELECT paragraphIndex, originalText, correctedText, manuallyCorrectedText, leadingSpace, correctionStatus
-                        FROM paragraphs
-                        WHERE chapterId = ?
-                        ORDER BY paragraphIndex ASC
-                        """,
-                        (chapter_id,),
-                ) as paragraphs_cursor:
-                    chapter.paragraphs = [
-                        Paragraph(
-                            index=row["paragraphIndex"],
-                            originalText=row["originalText"],
-                            correctedText=row["correctedText"],
-                            manuallyCorrectedText=row["manuallyCorrectedText"],
-                            leadingSpace=row["leadingSpace"],
-                            correctionStatus=row["correctionStatus"],
-                            partOfChapter=chapter_id,
-                        ) async for row in paragraphs_cursor
-                    ]
-
-            return chapter
+        try:
+            async with self._acquire_reader() as connection:
+                if chapter_data is None:
+                    generation = self._row_cache_generation
+
+                    # Fetch the main chapter data
+                    async with connection.execute(
+                            """
+                            SELECT id, name, chapterIndex, summary, projectId
+                            FROM chapters
+                            WHERE id = ?
+                            """,
+                            (chapter_id,),
+                    ) as chapter_cursor:
+                        chapter_cursor.row_factory = None
+                        chapter_data = await chapter_cursor.fetchone()
+
+                    # If no chapter is found, return None
+                    if not chapter_data:
+                        return None
+
+                    if generation == self._row_cache_generation:
+                        self._cache_put(self._chapter_row_cache, chapter_id, chapter_data, CHAPTER_ROW_CACHE_SIZE)
+
+                # Create the Chapter object
+                chapter = self._chapter_from_row(chapter_data)
+
+                # If requested, fetch all associated paragraphs
+                if include_paragraphs:
+                    async with connection.execute(
+                            """
+                            SELECT paragraphIndex, originalText, correctedText, manuallyCorrectedText, leadingSpace, correctionStatus
+                            FROM paragraphs
+                            WHERE chapterId = ?
+                            ORDER BY paragraphIndex ASC
+                            """,
+                            (chapter_id,),
+                    ) as paragraphs_cursor:
+                        # Plain tuples are cheaper to build than Row objects for the potentially thousands of rows
+                        paragraphs_cursor.row_factory = None
+                        chapter.paragraphs = [
+                            Paragraph(
+                                index=index,
+                                originalText=original_text,
+                                correctedText=corrected_text,
+                                manuallyCorrectedText=manually_corrected_text,
+                                leadingSpace=leading_space,
+                                correctionStatus=CorrectionStatus(correction_status),
+                                partOfChapter=chapter_id,
+                            ) for index, original_text, corrected_text, manually_corrected_text, leading_space,
+                            correction_status in await paragraphs_cursor.fetchall()
+                        ]
+
+                return chapter
 
         except Exception as e:
             # Handle and log errors
@@ -478,31 +623,39 @@ class Database:
         Returns:
             int | None: The chapter id, or None if not found.
         """
-        connection = self._connection
-
-        try:
-            # Fetch the main chapter data
-            async with connection.execute(
-                    """
-                    SELECT id
-                    FROM chapters
-                    WHERE projectId = ? AND name = ?
-                    """,
-                    (project_id, name),
-            ) as chapter_cursor:
-                chapter_data = await chapter_cursor.fetchone()
+        chapter_ids = self._chapter_id_cache.get(project_id)
 
-            # If no chapter is found, return None
-            if not chapter_data:
-                return None
+        if chapter_ids is not None:
+            self._chapter_id_cache.move_to_end(project_id)
+            return chapter_ids.get(name)
 
-            return int(chapter_data["id"])
+        try:
+            async with self._acquire_reader() as connection:
+                # Fetch all the chapter names of the project at once to have them all cached
+                async with connection.execute(
+                        """
+                        SELECT id, name
+                        FROM chapters
+                        WHERE projectId = ?
+                        ORDER BY id ASC
+                        """,
+                        (project_id,),
+                ) as chapter_cursor:
+                    chapter_ids = {}
+                    for row in await chapter_cursor.fetchall():
+                        # In case of duplicate names, the first chapter wins
+                        chapter_ids.setdefault(row["name"], int(row["id"]))
 
         except Exception as e:
             # Handle and log errors
             print(f"Error looking for chapter by name: {e}")
             return None
 
+        self._cache_put(self._chapter_id_cache, project_id, chapter_ids, CHAPTER_ID_CACHE_SIZE)
+
+        # If no chapter is found, returns None
+        return chapter_ids.get(name)
+
     async def get_chapter_paragraph_text(self, chapter_id: int) -> List[Paragraph]:
         """
         Fetches all paragraphs associated with a given chapter ID. Only returns the primary text.
@@ -514,31 +667,32 @@ class Database:
         Returns:
             List[Paragraph]: A list of Paragraph objects, or an empty list if no paragraphs are found.
         """
-        connection = self._connection
-
         try:
-            # Fetch paragraphs for the specified chapter
-            async with connection.execute(
-                    """
-                    SELECT paragraphIndex, originalText, leadingSpace
-                    FROM paragraphs
-                    WHERE chapterId = ?
-                    ORDER BY paragraphIndex ASC
-                    """,
-                    (chapter_id,),
-            ) as paragraphs_cursor:
-                paragraphs = [
-                    Paragraph(
-                        index=row["paragraphIndex"],
-                        originalText=row["originalText"],
-                        leadingSpace=row["leadingSpace"],
-                        partOfChapter=chapter_id,
-                        correctedText=None,
-                        manuallyCorrectedText=None,
-                    ) async for row in paragraphs_cursor
-                ]
-
-            return paragraphs
+            async with self._acquire_reader() as connection:
+                # Fetch paragraphs for the specified chapter
+                async with connection.execute(
+                        """
+                        SELECT paragraphIndex, originalText, leadingSpace
+                        FROM paragraphs
+                        WHERE chapterId = ?
+                        ORDER BY paragraphIndex ASC
+                        """,
+                        (chapter_id,),
+                ) as paragraphs_cursor:
+                    # Plain tuples are cheaper to build than Row objects for the potentially thousands of rows
+                    paragraphs_cursor.row_factory = None
+                    paragraphs = [
+                        Paragraph(
+                            index=index,
+                            originalText=original_text,
+                            leadingSpace=leading_space,
+                            partOfChapter=chapter_id,
+                            correctedText=None,
+                            manuallyCorrectedText=None,
+                        ) for index, original_text, leading_space in await paragraphs_cursor.fetchall()
+                    ]
+
+                return paragraphs
 
         except Exception as e:
             # Handle and log database errors (optional logging)
@@ -546,47 +700,52 @@ class Database:
             return []
 
     async def get_paragraphs_ids_needing_actions(self, chapter_id) -> List[int]:
-        connection = self._connection
-
         try:
-            # Fetch paragraphs for the specified chapter
-            async with connection.execute(
-                    f"""
-                    SELECT paragraphIndex
-                    FROM paragraphs
-                    WHERE chapterId = ? AND correctionStatus != {CorrectionStatus.notRequired.value}
-                    AND correctionStatus != {CorrectionStatus.accepted.value} 
-                    AND correctionStatus != {CorrectionStatus.rejected.value}
-                    """,
-                    (chapter_id,),
-            ) as paragraphs_cursor:
-                return [
-                    int(row["paragraphIndex"])
-                    async for row in paragraphs_cursor
-                ]
+            async with self._acquire_reader() as connection:
+                # Fetch paragraphs for the specified chapter
+                async with connection.execute(
+                        PARAGRAPHS_NEEDING_ACTION_SQL,
+                        (chapter_id,),
+                ) as paragraphs_cursor:
+                    # Only one integer column is selected, so it can be returned as is
+                    return [row[0] for row in await paragraphs_cursor.fetchall()]
 
         except Exception as e:
             # Handle and log database errors (optional logging)
             print(f"Error fetching paragraph data: {e}")
             return []
 
-    async def get_paragraphs_with_accepted_corrections(self, chapter_id) -> List[int]:
-        connection = self._connection
+    async def get_next_paragraph_needing_action(self, chapter_id: int, current: int,
+                                                reverse: bool = False) -> int | None:
+        """
+        Finds the index of the next (or previous if reverse) paragraph needing action relative to the current one.
+        If there isn't one in that direction, the last (or first) paragraph needing action is returned.
 
-        try:
-            # Fetch paragraphs for the specified chapter
+        :return: The paragraph index or None if no paragraphs in the chapter need action
+        """
+        async with self._acquire_reader() as connection:
             async with connection.execute(
-                    f"""
-                    SELECT paragraphIndex
-                    FROM paragraphs
-                    WHERE chapterId = ? AND correctionStatus = {CorrectionStatus.accepted.value}
-                    """,
-                    (chapter_id,),
-            ) as paragraphs_cursor:
-                return [
-                    int(row["paragraphIndex"])
-                    async for row in paragraphs_cursor
-                ]
+                    PREVIOUS_PARAGRAPH_NEEDING_ACTION_SQL if reverse else NEXT_PARAGRAPH_NEEDING_ACTION_SQL,
+                    (chapter_id, current, chapter_id),
+            ) as cursor:
+                row = await cursor.fetchone()
+
+        return row[0]
+
+    async def get_paragraphs_with_accepted_corrections(self, chapter_id) -> List[int]:
+        try:
+            async with self._acquire_reader() as connection:
+                # Fetch paragraphs for the specified chapter
+                async with connection.execute(
+                        f"""
+                        SELECT paragraphIndex
+                        FROM paragraphs
+                        WHERE chapterId = ? AND correctionStatus = {CorrectionStatus.accepted.value}
+                        """,
+                        (chapter_id,),
+                ) as paragraphs_cursor:
+                    # Only one integer column is selected, so it can be returned as is
+                    return [row[0] for row in await paragraphs_cursor.fetchall()]
 
         except Exception as e:
             # Handle and log database errors (optional logging)
@@ -594,30 +753,29 @@ class Database:
             return []
 
     async def get_paragraphs_around(self, chapter_id, paragraph_index, num_around=2) -> List[Paragraph]:
-        connection = self._connection
-
         try:
-            async with connection.execute(
-                    f"""
-                    SELECT paragraphIndex, originalText, leadingSpace, correctionStatus, correctedText, manuallyCorrectedText
-                    FROM paragraphs
-                    WHERE chapterId = ? AND paragraphIndex BETWEEN ? AND ?
-                    ORDER BY paragraphIndex ASC
-                    """,
-                    (chapter_id, paragraph_index - num_around, paragraph_index + num_around),
-            ) as paragraphs_cursor:
-                return [
-                    Paragraph(
-                        partOfChapter=chapter_id,
-                        index=row["paragraphIndex"],
-                        originalText=row["originalText"],
-                        leadingSpace=row["leadingSpace"],
-                        correctedText=row["correctedText"],
-                        manuallyCorrectedText=row["manuallyCorrectedText"],
-                        correctionStatus=row["correctionStatus"],
-                    )
-                    async for row in paragraphs_cursor
-                ]
+            async with self._acquire_reader() as connection:
+                async with connection.execute(
+                        f"""
+                        SELECT paragraphIndex, originalText, leadingSpace, correctionStatus, correctedText, manuallyCorrectedText
+                        FROM paragraphs
+                        WHERE chapterId = ? AND paragraphIndex BETWEEN ? AND ?
+                        ORDER BY paragraphIndex ASC
+                        """,
+                        (chapter_id, paragraph_index - num_around, paragraph_index + num_around),
+                ) as paragraphs_cursor:
+                    return [
+                        Paragraph(
+                            partOfChapter=chapter_id,
+                            index=row["paragraphIndex"],
+                            originalText=row["originalText"],
+                            leadingSpace=row["leadingSpace"],
+                            correctedText=row["correctedText"],
+                            manuallyCorrectedText=row["manuallyCorrectedText"],
+                            correctionStatus=CorrectionStatus(row["correctionStatus"]),
+                        )
+                        for row in await paragraphs_cursor.fetchall()
+                    ]
 
         except Exception as e:
             print(f"Error fetching paragraph data: {e}")
@@ -633,10 +791,10 @@ class Database:
         Raises:
             ValueError: If no chapter with the specified ID exists.
         """
-        async with self._lock:  # Ensure thread safety
-            connection = self._connection
-
-            result = await connection.execute(
+        # The writer is in autocommit mode so this single statement doesn't need a commit. The lock is only held to
+        # not run in the middle of another method's explicit transaction on the shared connection.
+        async with self._lock:
+            result = await self._connection.execute(
                 """
                 UPDATE chapters
                 SET name = ?, summary = ?
@@ -644,41 +802,58 @@ class Database:
                 """,
                 (chapter.name, chapter.summary, chapter.id)
             )
-            if result.rowcount == 0:
-                raise ValueError(f"No chapter found with ID {chapter.id}")
 
-            await connection.commit()
+        if result.rowcount == 0:
+            raise ValueError(f"No chapter found with ID {chapter.id}")
+
+        # Name may have changed
+        self._chapter_id_cache.pop(chapter.projectId, None)
+        self._chapter_row_cache.pop(chapter.id, None)
+        self._row_cache_generation += 1
 
     async def get_paragraph(self, chapter_id: int, paragraph_index: int) -> Paragraph | None:
-        connection = self._connection
+        key = (chapter_id, paragraph_index)
 
-        try:
-            async with connection.execute(
-                    """
-                    SELECT originalText, leadingSpace, correctionStatus, correctedText, manuallyCorrectedText
-                    FROM paragraphs
-                    WHERE chapterId = ? AND paragraphIndex = ?
-                    """,
-                    (chapter_id, paragraph_index),
-            ) as paragraph_cursor:
-                paragraph_data = await paragraph_cursor.fetchone()
+        paragraph_data = self._paragraph_row_cache.get(key)
+        if paragraph_data is not None:
+            self._paragraph_row_cache.move_to_end(key)
+        else:
+            generation = self._row_cache_generation
+
+            try:
+                async with self._acquire_reader() as connection:
+                    async with connection.execute(
+                            """
+                            SELECT originalText, leadingSpace, correctionStatus, correctedText, manuallyCorrectedText
+                            FROM paragraphs
+                            WHERE chapterId = ? AND paragraphIndex = ?
+                            """,
+                            key,
+                    ) as paragraph_cursor:
+                        paragraph_cursor.row_factory = None
+                        paragraph_data = await paragraph_cursor.fetchone()
+
+            except Exception as e:
+                print(f"Error fetching paragraph data: {e}")
+                return None
 
             if not paragraph_data:
                 return None
 
-            return Paragraph(
-                partOfChapter=chapter_id,
-                index=paragraph_index,
-                originalText=paragraph_data["originalText"],
-                leadingSpace=paragraph_data["leadingSpace"],
-                correctedText=paragraph_data["correctedText"],
-                manuallyCorrectedText=paragraph_data["manuallyCorrectedText"],
-                correctionStatus=paragraph_data["correctionStatus"],
-            )
+            if generation == self._row_cache_generation:
+                self._cache_put(self._paragraph_row_cache, key, paragraph_data, PARAGRAPH_ROW_CACHE_SIZE)
 
-        except Exception as e:
-            print(f"Error fetching paragraph data: {e}")
-            return None
+        original_text, leading_space, correction_status, corrected_text, manually_corrected_text = paragraph_data
+
+        return Paragraph(
+            partOfChapter=chapter_id,
+            index=paragraph_index,
+            originalText=original_text,
+            leadingSpace=leading_space,
+            correctedText=corrected_text,
+            manuallyCorrectedText=manually_corrected_text,
+            correctionStatus=CorrectionStatus(correction_status),
+        )
 
     async def update_paragraph(self, paragraph: Paragraph):
         """
@@ -686,45 +861,69 @@ class Database:
 
         :param paragraph: paragraph object with updated details.
         """
-        async with self._lock:  # Ensure thread safety
-            connection = self._connection
-
-            result = await connection.execute(
-                """
-                UPDATE paragraphs
-                SET correctedText = ?, manuallyCorrectedText = ?, correctionStatus = ?, leadingSpace = ?
-                WHERE chapterId = ? AND paragraphIndex = ?
-                """,
+        # Single autocommitted statement, see update_chapter
+        async with self._lock:
+            result = await self._connection.execute(
+                PARAGRAPH_UPDATE_SQL,
                 (paragraph.correctedText, paragraph.manuallyCorrectedText, paragraph.correctionStatus,
                  paragraph.leadingSpace, paragraph.partOfChapter, paragraph.index)
             )
-            if result.rowcount == 0:
-                raise ValueError(f"No paragraph found with ID {paragraph.partOfChapter}-{paragraph.index}")
 
-            await connection.commit()
+        self._paragraph_row_cache.pop((paragraph.partOfChapter, paragraph.index), None)
+        self._row_cache_generation += 1
+
+        if result.rowcount == 0:
+            raise ValueError(f"No paragraph found with ID {paragraph.partOfChapter}-{paragraph.index}")
+
+    async def update_paragraph_status(self, chapter_id: int, paragraph_index: int, status: CorrectionStatus) -> bool:
+        """
+        Updates just the correction status of a paragraph, without needing to fetch the paragraph first.
+
+        :return: False if the paragraph doesn't exist
+        """
+        async with self._lock:
+            result = await self._connection.execute(PARAGRAPH_STATUS_UPDATE_SQL, (status, chapter_id, paragraph_index))
+
+        self._paragraph_row_cache.pop((chapter_id, paragraph_index), None)
+        self._row_cache_generation += 1
+
+        return result.rowcount > 0
+
+    async def clear_paragraph_corrections(self, chapter_id: int, paragraph_index: int) -> bool:
+        """
+        Removes all corrections from a paragraph and resets it to the not generated state.
+
+        :return: False if the paragraph doesn't exist
+        """
+        async with self._lock:
+            result = await self._connection.execute(PARAGRAPH_CLEAR_SQL, (chapter_id, paragraph_index))
+
+        self._paragraph_row_cache.pop((chapter_id, paragraph_index), None)
+        self._row_cache_generation += 1
+
+        return result.rowcount > 0
 
     async def get_config(self) -> ConfigModel:
         """
-        Fetch configuration asynchronously, using a cached copy if valid.
+        Fetch configuration asynchronously, using the cached copy if it has already been loaded.
 
         Returns:
             ConfigModel: Configuration details.
         """
-        async with self._lock:  # Ensure thread safety
-            current_time = time.time()
+        # This doesn't need the lock as the worst case is just an extra fetch when the cache is not loaded yet
+        cached_config = self._config_cache
+        if cached_config is not None:
+            return cached_config
 
-            # Check if cache is valid
-            if (
-                    self._config_cache is not None and
-                    self._config_cache_timestamp is not None and
-                    (current_time - self._config_cache_timestamp) < self._CACHE_TTL
-            ):
-                # Return the cached copy if it's still valid
+        # Lock is needed to not overwrite a concurrent update_config with stale data
+        async with self._lock:
+            # Another call may have loaded the config while this was waiting for the lock
+            if self._config_cache is not None:
                 return self._config_cache
 
-            db = self._connection
-            async with db.execute("SELECT * FROM config WHERE id = 1") as cursor:
-                row = await cursor.fetchone()
+            async with self._acquire_reader() as db:
+                async with db.execute("SELECT * FROM config WHERE id = 1") as cursor:
+                    row = await cursor.fetchone()
 
             if row:
                 config = ConfigModel(selectedModel=row["selectedModel"],
@@ -739,9 +938,7 @@ class Database:
                 print("WARNING: no configuration found, using default values")
                 config = default_config
 
-            # Update the cache with new data and current timestamp
             self._config_cache = config
-            self._config_cache_timestamp = current_time
 
             return config
 
@@ -752,11 +949,11 @@ class Database:
         Args:
             new_config (ConfigModel): New configuration to save.
         """
-        async with self._lock:  # Ensure thread safety
-            db = self._connection
-
+        # Single autocommitted statement, see update_chapter. The cache write is kept inside the lock so that a
+        # concurrent get_config can't overwrite it with the old data.
+        async with self._lock:
             # Update existing configuration
-            await db.execute("""
+            await self._connection.execute("""
                 UPDATE config
                 SET selectedModel = ?, correctionReRuns = ?, autoSummaries = ?, styleExcerptLength = ?, 
                 simultaneousCorrectionSize = ?, unusedAIUnloadDelay = ?, customOllamaUrl = ?
@@ -772,43 +969,190 @@ class Database:
                 1
             ))
 
-            await db.commit()  # Save the changes
-
             # Immediately make new config available through the cache
             self._config_cache = new_config
 
-    async def _insert_chapter(self, connection: Connection, chapter: Chapter, project_id: int):
-        chapter_cursor = await connection.execute(
-            """
-            INSERT INTO chapters (projectId, chapterIndex, name, summary)
-            VALUES (?, ?, ?, ?)
-            """,
-            (project_id, chapter.chapterIndex, chapter.name, chapter.summary)
-        )
-        chapter_id = chapter_cursor.lastrowid
+    async def _open_connection(self, read_only: bool = False) -> Connection:
+        # Autocommit mode (isolation_level=None) is used as all transactions are explicitly started with BEGIN
+        connection = await aiosqlite.connect(str(self.db_file), isolation_level=None,
+                                             cached_statements=STATEMENT_CACHE_SIZE)
+
+        # Connection-wide setup is done just once here
+        connection.row_factory = aiosqlite.Row  # Return dictionary-like rows
+
+        if read_only:
+            await connection.execute("PRAGMA query_only=1;")
+        else:
+            await connection.execute("PRAGMA journal_mode=WAL;")  # Enable Write-Ahead Logging (WAL)
+            # Don't let the WAL file stay huge after a checkpoint (64 MiB), a long WAL slows down reads
+            await connection.execute("PRAGMA journal_size_limit=67108864;")
+
+        # With WAL this is still safe against app crashes, but avoids an fsync on every commit
+        await connection.execute("PRAGMA synchronous=NORMAL;")
+        await connection.execute("PRAGMA temp_store=MEMORY;")
+        await connection.execute("PRAGMA mmap_size=268435456;")  # 256 MiB
+        await connection.execute("PRAGMA cache_size=-65536;")  # 64 MiB
+        await connection.execute("PRAGMA wal_autocheckpoint=1000;")
+
+        return connection
+
+    def _invalidate_paragraph_rows(self):
+        self._paragraph_row_cache.clear()
+        self._row_cache_generation += 1
+
+    @staticmethod
+    def _cache_put(cache: OrderedDict, key, value, max_size: int):
+        """Stores a value in a LRU cache, dropping the least recently used entry if the cache is full"""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > max_size:
+            cache.popitem(last=False)
+
+    @staticmethod
+    def _chapter_from_row(chapter_data: tuple) -> Chapter:
+        chapter_id, name, chapter_index, summary, project_id = chapter_data
+        return Chapter(id=chapter_id, name=name, chapterIndex=chapter_index, summary=summary, projectId=project_id,
+                       paragraphs=[])
+
+    @asynccontextmanager
+    async def _acquire_reader(self):
+        """
+        Borrows a read-only connection from the pool. Waits if all are in use (or the database is not yet initialized).
+        """
+        connection = await self._read_pool.get()
+        try:
+            yield connection
+        finally:
+            self._read_pool.put_nowait(connection)
+
+    async def _fetch_project_row(self, project_id: int):
+        async with self._acquire_reader() as connection:
+            async with connection.execute(
+                    """
+                    SELECT id, name, correctionStrengthLevel, stylePrompt
+                    FROM projects
+                    WHERE id = ?
+                    """,
+                    (project_id,),
+            ) as project_cursor:
+                return await project_cursor.fetchone()
 
-        for paragraph in chapter.paragraphs:
-            await connection.execute(
+    async def _fetch_project_chapters(self, project_id: int) -> List[Chapter]:
+        async with self._acquire_reader() as connection:
+            return await self._query_project_chapters(connection, project_id)
+
+    async def _fetch_project_chapters_with_paragraphs(self, project_id: int) -> List[Chapter]:
+        async with self._acquire_reader() as connection:
+            # Both queries need to see the same snapshot, otherwise a chapter added in between could have paragraphs
+            # that don't belong to any of the fetched chapters
+            await connection.execute("BEGIN")
+            try:
+                chapters = await self._query_project_chapters(connection, project_id)
+                paragraphs = await self._query_project_paragraphs(connection, project_id)
+            finally:
+                await connection.execute("COMMIT")
+
+        chapters_by_id = {chapter.id: chapter for chapter in chapters}
+        for paragraph in paragraphs:
+            chapters_by_id[paragraph.partOfChapter].paragraphs.append(paragraph)
+
+        return chapters
+
+    @staticmethod
+    async def _query_project_chapters(connection: Connection, project_id: int) -> List[Chapter]:
+        async with connection.execute(
                 """
-                INSERT INTO paragraphs (
-                    chapterId, paragraphIndex, originalText,
-                    correctedText, manuallyCorrectedText, leadingSpace, correctionStatus
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                SELECT id, name, chapterIndex, summary
+                FROM chapters
+                WHERE projectId = ?
+                ORDER BY chapterIndex ASC
                 """,
-                (
-                    chapter_id,
-                    paragraph.index,
-                    paragraph.originalText,
-                    paragraph.correctedText,
-                    paragraph.manuallyCorrectedText,
-                    paragraph.leadingSpace,
-                    paragraph.correctionStatus,
-                )
-            )
+                (project_id,),
+        ) as chapters_cursor:
+            return [
+                Chapter(id=row[0], projectId=project_id, name=row[1], chapterIndex=row[2], summary=row[3],
+                        paragraphs=[]) for row in await chapters_cursor.fetchall()
+            ]
+
+    @staticmethod
+    async def _query_project_paragraphs(connection: Connection, project_id: int) -> List[Paragraph]:
+        async with connection.execute(
+                """
+                SELECT p.chapterId, p.paragraphIndex, p.originalText, p.correctedText, p.manuallyCorrectedText,
+                       p.leadingSpace, p.correctionStatus
+                FROM paragraphs p
+                JOIN chapters c ON c.id = p.chapterId
+                WHERE c.projectId = ?
+                ORDER BY p.chapterId, p.paragraphIndex ASC
+                """,
+                (project_id,),
+        ) as paragraphs_cursor:
+            paragraphs_cursor.row_factory = None
+            return [
+                Paragraph(
+                    partOfChapter=chapter_id,
+                    index=index,
+                    originalText=original_text,
+                    correctedText=corrected_text,
+                    manuallyCorrectedText=manually_corrected_text,
+                    leadingSpace=leading_space,
+                    correctionStatus=CorrectionStatus(correction_status),
+                ) for chapter_id, index, original_text, corrected_text, manually_corrected_text, leading_space,
+                correction_status in await paragraphs_cursor.fetchall()
+            ]
+
+    async def _insert_chapters(self, connection: Connection, chapters: List[Chapter], project_id: int):
+        """
+        Inserts chapters along with their paragraphs. Chapters are inserted with multi-row statements that return the
+        new IDs, after which all the paragraphs are written in batches.
+        """
+        paragraph_rows = []
+
+        for start in range(0, len(chapters), CHAPTER_INSERT_BATCH_SIZE):
+            batch = chapters[start:start + CHAPTER_INSERT_BATCH_SIZE]
+
+            async with connection.execute(
+                    f"""
+                    INSERT INTO chapters (projectId, chapterIndex, name, summary)
+                    VALUES {", ".join(["(?, ?, ?, ?)"] * len(batch))}
+                    RETURNING id
+                    """,
+                    [value for chapter in batch for value in
+                     (project_id, chapter.chapterIndex, chapter.name, chapter.summary)]
+            ) as chapter_cursor:
+                # RETURNING doesn't guarantee row order, but AUTOINCREMENT IDs are handed out in the VALUES order
+                chapter_ids = sorted(row[0] for row in await chapter_cursor.fetchall())
+
+            for chapter_id, chapter in zip(chapter_ids, batch):
+                paragraph_rows.extend(
+                    _paragraph_insert_params(chapter_id, paragraph.index, paragraph) for paragraph in
+                    chapter.paragraphs)
+
+        await self._insert_paragraph_rows(connection, paragraph_rows)
+
+    @staticmethod
+    async def _insert_paragraph_rows(connection: Connection, rows: List[tuple]):
+        """
+        Inserts paragraphs from parameter tuples made with _paragraph_insert_params. Each statement writes a whole
+        batch of rows so that there's only one round trip to the database thread per batch.
+        """
+        for start in range(0, len(rows), PARAGRAPH_INSERT_BATCH_SIZE):
+            batch = rows[start:start + PARAGRAPH_INSERT_BATCH_SIZE]
+
+            if len(batch) == PARAGRAPH_INSERT_BATCH_SIZE:
+                sql = PARAGRAPH_INSERT_BATCH_SQL
+            else:
+                sql = PARAGRAPH_INSERT_PREFIX_SQL + ", ".join([PARAGRAPH_INSERT_ROW_SQL] * len(batch))
+
+            await connection.execute(sql, [value for row in batch for value in row])
 
     async def _migrate_database(self, db, existing_config):
-        if existing_config["version"] == 1:
+        """
+        Migrates the database by one version. Called in a loop until the latest version is reached.
+        """
+        version = existing_config["version"]
+
+        if version == 1:
             await db.execute(
                 f"ALTER TABLE config ADD COLUMN styleExcerptLength INTEGER NOT NULL DEFAULT {default_config.styleExcerptLength}")
             await db.execute(
@@ -817,23 +1161,22 @@ class Database:
                 f"ALTER TABLE config ADD COLUMN unusedAIUnloadDelay INTEGER NOT NULL DEFAULT {default_config.unusedAIUnloadDelay}")
 
             await self._on_version_migrated(db, existing_config, 2)
-
-        if existing_config["version"] == 2:
+        elif version == 2:
             await db.execute("""
                 CREATE UNIQUE INDEX idx_unique_project_name ON projects (name);
             """)
 
             await self._on_version_migrated(db, existing_config, 3)
-        if existing_config["version"] == 3:
+        elif version == 3:
             await db.execute("ALTER TABLE paragraphs ADD COLUMN correctionStatus INTEGER NOT NULL DEFAULT 0")
 
             await self._on_version_migrated(db, existing_config, 4)
-        if existing_config["version"] == 4:
+        elif version == 4:
             await db.execute("ALTER TABLE config ADD COLUMN customOllamaUrl TEXT")
 
             await self._on_version_migrated(db, existing_config, 5)
         else:
-            raise Exception(f"Unknown database version: {existing_config['version']}")
+            raise Exception(f"Unknown database version: {version}")
 
     async def _on_version_migrated(self, db, existing_config, new_version):
         existing_config["version"] = new_version
@@ -894,6 +1237,32 @@ class Database:
 
         await db.commit()
 
+    @staticmethod
+    async def _create_indexes_if_missing(db):
+        """
+        Creates the indexes. This is done after migrations as the indexes can use columns that old databases don't
+        have yet. These are checked on each startup so existing databases get new indexes without a migration.
+        """
+        await db.execute("BEGIN TRANSACTION;")
+
+        # Indexes for the common lookups. Paragraph lookups by chapter are already covered by the primary key.
+        await db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_chapters_project_name ON chapters (projectId, name);
+        """)
+
+        # Project chapter lists are in chapter order, this lets SQLite read them in order without a separate sort
+        await db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_chapters_project_index ON chapters (projectId, chapterIndex);
+        """)
+
+        # Partial index matching exactly the filter in get_paragraphs_ids_needing_actions
+        await db.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_paragraphs_needing_action ON paragraphs (chapterId, paragraphIndex)
+                WHERE {NEEDING_ACTION_FILTER_SQL};
+        """)
+
+        await db.commit()
+
 
 # Singleton instance of the database
 database = Database()
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from enum import Enum
 from typing import Optional, List
 
@@ -22,7 +23,11 @@ class CorrectionStatus(int, Enum):
     rejected = 5
 
 
-class Paragraph(BaseModel):
+# These two are plain slotted dataclasses (instead of BaseModel) as they are created in large numbers, and without a
+# __dict__ per instance they take a lot less memory. They are not validated on construction, so the database code
+# converts the correction status to the enum itself.
+@dataclass(slots=True)
+class Paragraph:
     partOfChapter: int
     index: int
     originalText: str
@@ -38,7 +43,8 @@ class Paragraph(BaseModel):
     correctionStatus: CorrectionStatus = CorrectionStatus.notGenerated  # Default value
 
 
-class Chapter(BaseModel):
+@dataclass(slots=True)
+class Chapter:
     id: int
     projectId: int
     chapterIndex: int
@@ -79,18 +85,14 @@ def create_project(name: str, style_prompt: str, correction_strength_level: int,
             "Correction strength level must be between 1 and 3"
         )
 
-    parsed_chapters = []
-    index_counter = 1
-
-    for chapter in chapters:
-
-        # We rebuild the paragraph index here even if not totally required
-        paragraph_index = 1
-
-        parsed_paragraphs = []
-
-        for paragraph in chapter.paragraphs:
-            parsed_paragraphs.append(
+    # We rebuild the paragraph indexes here even if not totally required
+    parsed_chapters = [
+        Chapter(
+            id=0,
+            projectId=0,
+            chapterIndex=chapter_index,
+            name=chapter.title,
+            paragraphs=[
                 Paragraph(
                     partOfChapter=0,
                     index=paragraph_index,
@@ -98,23 +100,11 @@ def create_project(name: str, style_prompt: str, correction_strength_level: int,
                     correctedText=None,
                     manuallyCorrectedText=None,
                     leadingSpace=paragraph.leadingSpace
-                )
-            )
-
-            paragraph_index += 1
-
-        parsed_chapters.append(
-            Chapter(
-                id=0,
-                projectId=0,
-                chapterIndex=index_counter,
-                name=chapter.title,
-                paragraphs=parsed_paragraphs,
-                summary=None,
-            )
-        )
-
-        index_counter += 1
+                ) for paragraph_index, paragraph in enumerate(chapter.paragraphs, start=1)
+            ],
+            summary=None,
+        ) for chapter_index, chapter in enumerate(chapters, start=1)
+    ]
 
     if len(parsed_chapters) < 1:
         raise ValueError(
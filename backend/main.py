@@ -1,24 +1,48 @@
 import asyncio
+import codecs
+import hashlib
 import os
-import re
+import stat
+import time
 from asyncio import Lock
-from typing import Dict, Optional
-
-from fastapi import FastAPI, UploadFile, HTTPException, Form, File, BackgroundTasks
-from fastapi.responses import FileResponse, PlainTextResponse, HTMLResponse
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import IO, Any, Awaitable, Callable, Dict, Optional, List, Tuple
+
+from pydantic import BaseModel, TypeAdapter
+from fastapi import FastAPI, UploadFile, HTTPException, Form, File, BackgroundTasks, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse, HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
-from starlette.responses import RedirectResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.responses import RedirectResponse, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from ai.ai_manager import AIManager
 from ai.ollama_client import OllamaClient
 from db.config import ConfigModel
-from db.project import create_project, CorrectionStatus
+from db.project import create_project, CorrectionStatus, Project, Chapter, Paragraph
 from db.database import database
-from utils.epub import extract_epub_chapters, chapters_to_plain_text
+from utils.epub import extract_epub_chapters, chapters_to_plain_text, Chapter as EpubChapter
 from utils.correction_formatter import format_chapter_corrections_as_text, parse_mode
 
-# FastAPI web app setup
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Database must be fully ready before any requests are let through
+    await database.initialize()
+    yield
+    await ollama_client.aclose()
+    if _ai_manager_instance is not None:
+        await _ai_manager_instance.aclose()
+    await database.close()
+
+
+# FastAPI web app setup. The endpoints returning a lot of data have return types declared as that way FastAPI
+# serializes the data directly to JSON with pydantic, which is a lot faster than the default generic encoder.
+app = FastAPI(lifespan=lifespan)
 
 # Path to the exported static files from Next.js
 frontend_build_path = os.path.abspath("../frontend/build")
@@ -26,14 +50,115 @@ frontend_build_path = os.path.abspath("../frontend/build")
 # Mount the static path for CSS/JS files from the React build
 app.mount("/_next", StaticFiles(directory=os.path.join(frontend_build_path, "_next")), name="_next")
 
-# Serving root content like this will break everything
-# app.mount("/", StaticFiles(directory=frontend_build_path), name="")
+# Other frontend files are served by a catch-all mount at the end of this file
+
+# The index page is served for all SPA routes so it is kept in memory. A rebuilt frontend needs a backend restart.
+with open(os.path.join(frontend_build_path, "index.html"), "rb") as index_file:
+    frontend_index_html = index_file.read()
+
+# Lets browsers revalidate the index page with a 304 response instead of downloading it again. Weak as the page goes
+# through gzip compression.
+frontend_index_etag = 'W/"' + hashlib.md5(frontend_index_html, usedforsecurity=False).hexdigest() + '"'
+
+
+def index_response(request_headers: Headers) -> Response:
+    if frontend_index_etag in request_headers.get("if-none-match", ""):
+        return Response(status_code=304, headers={"ETag": frontend_index_etag})
+
+    return HTMLResponse(frontend_index_html, headers={"ETag": frontend_index_etag})
 
 
 # Other setup
 
 downloaded_recommended = False
 
+# Used to encode extracted chapters to JSON in a background thread, as for a big book that takes a while
+epub_chapters_adapter = TypeAdapter(List[EpubChapter])
+
+# Epub parses that are currently running keyed by the uploaded file hash. If the same book is uploaded again (for
+# example by a double click) while it is still being parsed, the new request just waits for the existing parse.
+_epub_parses_in_progress: Dict[str, asyncio.Future] = {}
+
+# Results of the latest parses, as creating a project first uploads the book for style analysis and then again for
+# the project itself. Least recently used results are dropped first.
+PARSED_EPUB_CACHE_SIZE = 4
+_parsed_epubs: OrderedDict[str, List[EpubChapter]] = OrderedDict()
+
+
+def hash_upload(file_content: IO[bytes]) -> str:
+    hasher = hashlib.blake2b()
+
+    file_content.seek(0)
+    for block in iter(lambda: file_content.read(1024 * 1024), b""):
+        hasher.update(block)
+    file_content.seek(0)
+
+    return hasher.hexdigest()
+
+
+def _epub_parse_done(file_hash: str, parse: asyncio.Future):
+    _epub_parses_in_progress.pop(file_hash, None)
+
+    if parse.cancelled() or parse.exception() is not None:
+        return
+
+    _parsed_epubs[file_hash] = parse.result()
+    if len(_parsed_epubs) > PARSED_EPUB_CACHE_SIZE:
+        _parsed_epubs.popitem(last=False)
+
+
+async def parse_epub_upload(file: UploadFile) -> List[EpubChapter]:
+    """
+    Parses an uploaded epub. The returned chapters may be shared with other requests, so they must not be modified.
+    """
+    # Parsing is slow for big books, so it's run in a thread to not block other requests
+    file_hash = await asyncio.to_thread(hash_upload, file.file)
+
+    chapters = _parsed_epubs.get(file_hash)
+    if chapters is not None:
+        _parsed_epubs.move_to_end(file_hash)
+        return chapters
+
+    parse = _epub_parses_in_progress.get(file_hash)
+
+    if parse is None:
+        parse = asyncio.ensure_future(asyncio.to_thread(extract_epub_chapters, file.file))
+        _epub_parses_in_progress[file_hash] = parse
+        parse.add_done_callback(partial(_epub_parse_done, file_hash))
+
+    # Shielded so that one request being cancelled doesn't cancel the parse for the others waiting on it
+    return await asyncio.shield(parse)
+
+# Shared client for the AI info endpoints so that the connections to ollama are reused. These run their requests
+# directly on the event loop.
+ollama_client = OllamaClient()
+
+# How long (in seconds) successful ollama info results are reused. The frontend polls these, but they rarely change.
+# Available models is kept short so that models pulled outside this app show up quickly.
+OLLAMA_MODELS_CACHE_TIME = 10
+OLLAMA_LOADED_CACHE_TIME = 2
+OLLAMA_VERSION_CACHE_TIME = 300
+
+_ollama_info_cache: Dict[str, Tuple[float, Any]] = {}
+
+
+async def cached_ollama_info(key: str, max_age: float, fetch: Callable[[], Awaitable[Any]],
+                             is_error: Callable[[Any], bool] = lambda _: False) -> Any:
+    cached = _ollama_info_cache.get(key)
+    now = time.monotonic()
+
+    if cached is not None and now - cached[0] < max_age:
+        return cached[1]
+
+    result = await fetch()
+
+    # Errors are not cached so that the frontend sees ollama come back up right away
+    if not is_error(result):
+        _ollama_info_cache[key] = (now, result)
+
+    return result
+
+
 # Singleton instance of AIManager
 _ai_manager_instance: Optional[AIManager] = None
 _ai_manager_lock = Lock()
@@ -45,48 +170,166 @@ async def get_ai_manager():
     # Get latest config to ensure AI manager can be made up to date
     latest_config = await database.get_config()
 
-    async with _ai_manager_lock:  # Only one coroutine can access this block at a time
-        if _ai_manager_instance is None:
-            _ai_manager_instance = AIManager()
-            _ai_manager_instance.model = latest_config.selectedModel
-            print("AI manager started. Model: ", _ai_manager_instance.model)
-
-        if _ai_manager_instance.model != latest_config.selectedModel:
-            print("AI manager model changed. Old model: ", _ai_manager_instance.model, "New model: ",
-                  latest_config.selectedModel)
-            _ai_manager_instance.model = latest_config.selectedModel
-        _ai_manager_instance.unload_delay = latest_config.unusedAIUnloadDelay
-        _ai_manager_instance.custom_ollama = latest_config.customOllamaUrl
+    # The lock is only needed to create the instance once. The settings below are updated without any awaits in
+    # between, so no other coroutine can see them half updated.
+    if _ai_manager_instance is None:
+        async with _ai_manager_lock:
+            if _ai_manager_instance is None:
+                _ai_manager_instance = AIManager()
+                _ai_manager_instance.model = latest_config.selectedModel
+                print("AI manager started. Model: ", _ai_manager_instance.model)
+
+    if _ai_manager_instance.model != latest_config.selectedModel:
+        print("AI manager model changed. Old model: ", _ai_manager_instance.model, "New model: ",
+              latest_config.selectedModel)
+        _ai_manager_instance.model = latest_config.selectedModel
+    _ai_manager_instance.unload_delay = latest_config.unusedAIUnloadDelay
+    _ai_manager_instance.custom_ollama = latest_config.customOllamaUrl
 
     return _ai_manager_instance
 
 
-# Add middleware to modify headers
-@app.middleware("http")
-async def add_no_cache_headers(request, call_next):
-    response = await call_next(request)
-
-    # Apply no-cache headers only for non-static file requests
-    if "/_next/" not in request.url.path:
-        if "/api/" in request.url.path:
-            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate"
+# Middleware to modify headers. This is a plain ASGI middleware as @app.middleware("http") wraps each request in
+# extra tasks and streams, which is a lot of overhead for just setting a few headers.
+class NoCacheHeadersMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        # Apply no-cache headers only for non-static file requests. Both of these are only ever the first part of the
+        # path, so prefix checks are enough.
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["path"].startswith("/_next/"):
+            # Next.js puts a content hash in the names of the built files, so they never change and browsers can
+            # keep them without revalidating
+            if scope["path"].startswith("/_next/static/"):
+                await self.app(scope, receive, self._immutable_cache_sender(send))
+            else:
+                await self.app(scope, receive, send)
+            return
+
+        if scope["path"].startswith("/api/") and scope["method"] != "GET":
+            cache_control = "no-store, no-cache, must-revalidate"
         else:
-            response.headers["Cache-Control"] = "no-cache, must-revalidate"
+            # Get requests are allowed to be stored so that browsers can revalidate them with ApiETagMiddleware
+            cache_control = "no-cache, must-revalidate"
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["Cache-Control"] = cache_control
+                headers["Pragma"] = "no-cache"
+                headers["Expires"] = "0"
+
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    @staticmethod
+    def _immutable_cache_sender(send: Send) -> Send:
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                MutableHeaders(scope=message)["Cache-Control"] = "public, max-age=31536000, immutable"
+
+            await send(message)
+
+        return send_with_headers
+
+
+# Adds content based ETags to API get responses and answers with 304 when the browser already has the same data. The
+# data can change at any time due to AI work, so it is still fully generated for each request, but unchanged
+# projects and chapters don't need to be sent and parsed again by the frontend.
+class ApiETagMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "GET" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        response_start: Optional[Message] = None
+
+        async def send_with_etag(message: Message):
+            nonlocal response_start
+
+            if message["type"] == "http.response.start":
+                if message["status"] != 200:
+                    await send(message)
+                    return
+
+                # Held back until the body is known
+                response_start = message
+                return
+
+            if response_start is None:
+                await send(message)
+                return
+
+            if message.get("more_body", False):
+                # Streaming responses are passed through as is
+                await send(response_start)
+                response_start = None
+                await send(message)
+                return
+
+            # Weak as GZipMiddleware runs after this, and a strong ETag would then be shared by the compressed and
+            # uncompressed bodies
+            etag = 'W/"' + hashlib.blake2b(message.get("body", b""), digest_size=16).hexdigest() + '"'
+
+            if if_none_match is not None and etag in if_none_match:
+                await send({"type": "http.response.start", "status": 304, "headers": [(b"etag", etag.encode())]})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            MutableHeaders(scope=response_start)["ETag"] = etag
+            await send(response_start)
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+
+# Uploaded epub files are spooled to disk by the multipart parser, but there is still no reason to accept arbitrarily
+# large ones. This is way above any book size.
+MAX_UPLOAD_BYTES = 200 * 1024 * 1024
+
+
+# Rejects too large requests based on their declared size before any of the body is read
+class UploadSizeLimitMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            content_length = Headers(scope=scope).get("content-length")
+
+            if content_length is not None and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES:
+                response = JSONResponse({"detail": "Uploaded file is too large"}, status_code=413)
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
 
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
 
-    return response
+app.add_middleware(ApiETagMiddleware)
+app.add_middleware(NoCacheHeadersMiddleware)
+app.add_middleware(UploadSizeLimitMiddleware)
+
+# Chapter and project JSON is very repetitive so it compresses well. Added last so it wraps the other middleware.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 
 ############
 # API Routes
 ############
 @app.get("/")
-async def serve_index():
+async def serve_index(request: Request):
     # Serve the index.html for the root route
-    index_file = os.path.join(frontend_build_path, "index.html")
-    return FileResponse(index_file)
+    return index_response(request.headers)
 
 
 @app.get("/api/ping")
@@ -104,10 +347,14 @@ async def text_analysis(file: UploadFile):
     excerpt_length = (await database.get_config()).styleExcerptLength
 
     if content_type == "application/epub+zip":
-        chapters = extract_epub_chapters(file.file)
-        text = chapters_to_plain_text(chapters, excerpt_length)
+        chapters = await parse_epub_upload(file)
+        text = await asyncio.to_thread(chapters_to_plain_text, chapters, excerpt_length)
     elif content_type == "text/plain":
-        text = (await file.read()).decode("utf-8")
+        # Only the excerpt is used, so there's no need to read more than the longest possible UTF-8 encoding of it
+        # (4 bytes per character). The incremental decoder drops a character that gets cut at the end of the read.
+        # Invalid bytes are skipped as the excerpt is just a writing style sample for the AI.
+        raw_text = await file.read(excerpt_length * 4)
+        text = codecs.getincrementaldecoder("utf-8")(errors="ignore").decode(raw_text)
         text = text[:excerpt_length]
     else:
         raise HTTPException(status_code=415, detail="Unsupported media type")
@@ -116,12 +363,13 @@ async def text_analysis(file: UploadFile):
     return {"instructions": instructions}
 
 
-@app.post("/api/extractText")
+@app.post("/api/extractText", response_model=List[EpubChapter])
 async def extract_text(file: UploadFile):
     content_type = file.content_type
 
     if content_type == "application/epub+zip":
-        return extract_epub_chapters(file.file)
+        chapters = await parse_epub_upload(file)
+        return Response(await asyncio.to_thread(epub_chapters_adapter.dump_json, chapters), media_type="application/json")
     # TODO: reimplement text plain mode (needs paragraph objects)
     # elif content_type == "text/plain":
     #     # Split on blank lines
@@ -132,7 +380,7 @@ async def extract_text(file: UploadFile):
 
 
 @app.get("/api/ai/status")
-async def get_models():
+async def get_ai_status():
     ai_manager = await get_ai_manager()
 
     return {"thinking": ai_manager.currently_running, "queueLength": ai_manager.queue_length, "model": ai_manager.model}
@@ -140,12 +388,12 @@ async def get_models():
 
 # Project management endpoints
 @app.get("/api/projects")
-async def get_projects():
+async def get_projects() -> List[Project]:
     return await database.get_projects()
 
 
 @app.post("/api/projects/generateCorrections")
-async def generate_project_corrections(background_tasks: BackgroundTasks = BackgroundTasks()):
+async def generate_all_corrections(background_tasks: BackgroundTasks = BackgroundTasks()):
     projects = await database.get_projects()
 
     ai_manager = await get_ai_manager()
@@ -154,12 +402,12 @@ async def generate_project_corrections(background_tasks: BackgroundTasks = Backg
 
 
 @app.get("/api/projects/{project_id}")
-async def get_project(project_id: int):
+async def get_project(project_id: int) -> Project | None:
     return await database.get_project(project_id)
 
 
 @app.post("/api/projects/{project_id}/generateSummaries")
-async def get_project(project_id: int, background_tasks: BackgroundTasks):
+async def generate_project_summaries(project_id: int, background_tasks: BackgroundTasks):
     project = await database.get_project(project_id)
 
     if project is None:
@@ -197,14 +445,10 @@ async def generate_project_corrections(project_id: int, background_tasks: Backgr
 @app.post("/api/projects")
 async def create_new_project(name: str = Form(), writingStyle: str = Form(), levelOfCorrection: int = Form(),
                              file: UploadFile = File(), background_tasks: BackgroundTasks = BackgroundTasks()):
-    content_type = file.content_type
-
-    if content_type == "application/epub+zip":
-        chapters = extract_epub_chapters(file.file)
-    else:
+    if file.content_type != "application/epub+zip":
         raise HTTPException(status_code=415, detail="Unsupported file type to extract")
 
-    config = await database.get_config()
+    chapters, config = await asyncio.gather(parse_epub_upload(file), database.get_config())
 
     backend_project = create_project(name, writingStyle, levelOfCorrection, chapters)
 
@@ -234,7 +478,7 @@ async def project_update_text(project_id: int, file: UploadFile = File()):
     content_type = file.content_type
 
     if content_type == "application/epub+zip":
-        chapters = extract_epub_chapters(file.file)
+        chapters = await parse_epub_upload(file)
     else:
         raise HTTPException(status_code=415, detail="Unsupported file type to extract")
 
@@ -246,7 +490,7 @@ async def project_update_text(project_id: int, file: UploadFile = File()):
 
 
 @app.get("/api/chapters/{chapter_id}")
-async def get_chapter(chapter_id: int):
+async def get_chapter(chapter_id: int) -> Chapter:
     chapter = await database.get_chapter(chapter_id, include_paragraphs=True)
     if not chapter:
         raise HTTPException(status_code=404, detail="Chapter not found")
@@ -286,12 +530,13 @@ async def generate_chapter_corrections(chapter_id: int, background_tasks: Backgr
     :param background_tasks: Background tasks object to add the task to.
     :return: Success message if the request to generate is successfully queued.
     """
-    chapter = await database.get_chapter(chapter_id, True)
-    if not chapter:
+    # The project is needed for the correction strength setting. Both only need the chapter id so they are fetched at
+    # the same time.
+    chapter, project = await asyncio.gather(database.get_chapter(chapter_id, True),
+                                            database.get_project_by_chapter(chapter_id))
+    if not chapter or not project:
         raise HTTPException(status_code=404, detail="Chapter not found")
 
-    project = await database.get_project_by_chapter(chapter.id)
-
     ai_manager = await get_ai_manager()
 
     background_tasks.add_task(ai_manager.generate_corrections, chapter, database, project.correctionStrengthLevel)
@@ -301,7 +546,7 @@ async def generate_chapter_corrections(chapter_id: int, background_tasks: Backgr
 
 
 @app.get("/api/chapters/{chapter_id}/paragraphsWithCorrections")
-async def chapter_paragraphs_needing_actions(chapter_id: int):
+async def chapter_paragraphs_needing_actions(chapter_id: int) -> List[int]:
     """
     Endpoint to get a list of paragraphs with corrections for a specific chapter.
     :param chapter_id: The ID of the chapter the paragraphs belong to.
@@ -315,7 +560,7 @@ async def chapter_paragraphs_needing_actions(chapter_id: int):
 
 
 @app.get("/api/chapters/{chapter_id}/acceptedParagraphs")
-async def chapter_paragraphs_with_accepted_corrections(chapter_id: int):
+async def chapter_paragraphs_with_accepted_corrections(chapter_id: int) -> List[int]:
     """
     Endpoint to get a list of paragraphs with approved corrections for a specific chapter. To view them for an easy
     list of required corrections.
@@ -330,7 +575,7 @@ async def chapter_paragraphs_with_accepted_corrections(chapter_id: int):
 
 
 @app.get("/api/chapters/{chapter_id}/paragraphs/{paragraph_index}")
-async def get_paragraph(chapter_id: int, paragraph_index: int):
+async def get_paragraph(chapter_id: int, paragraph_index: int) -> Paragraph:
     paragraph = await database.get_paragraph(chapter_id, paragraph_index)
     if not paragraph:
         raise HTTPException(status_code=404, detail="Paragraph not found")
@@ -343,23 +588,20 @@ async def generate_correction(chapter_id: int, paragraph_index: int):
     """
     Generates a correction for a specific paragraph, but doesn't return it
     """
-    paragraph = await database.get_paragraph(chapter_id, paragraph_index)
-    if not paragraph:
+    # Need to get the project for the correction strength setting and the chapter to know what the index of it is.
+    # These don't depend on each other, so they are all fetched at once.
+    paragraph, project, chapter = await asyncio.gather(database.get_paragraph(chapter_id, paragraph_index),
+                                                       database.get_project_by_chapter(chapter_id),
+                                                       database.get_chapter(chapter_id))
+    if not paragraph or not project or not chapter:
         raise HTTPException(status_code=404, detail="Paragraph not found")
 
-    # Need to get the project for the correction strength setting
-    project = await database.get_project_by_chapter(paragraph.partOfChapter)
-
-    # And the chapter to know what the index of it is
-    chapter = await database.get_chapter(paragraph.partOfChapter)
-
-    config = await database.get_config()
-
     ai_manager = await get_ai_manager()
 
     try:
         # As this is meant to be a fast API don't use re-runs
-        # await ai_manager.generate_single_correction(paragraph, chapter, project.correctionStrengthLevel, config.correctionReRuns)
+        # await ai_manager.generate_single_correction(paragraph, chapter, project.correctionStrengthLevel,
+        #                                           (await database.get_config()).correctionReRuns)
         await ai_manager.generate_single_correction(paragraph, chapter, project.correctionStrengthLevel, 0)
 
         await database.update_paragraph(paragraph)
@@ -374,23 +616,22 @@ async def clear_paragraph_data(chapter_id: int, paragraph_index: int):
     """
     Clears paragraph data state to allow restarting its correcting
     """
-    paragraph = await database.get_paragraph(chapter_id, paragraph_index)
-    if not paragraph:
-        raise HTTPException(status_code=404, detail="Paragraph not found")
-
-    paragraph.correctedText = None
-    paragraph.manuallyCorrectedText = None
-    paragraph.correctionStatus = CorrectionStatus.notGenerated
-
     try:
-        await database.update_paragraph(paragraph)
+        found = await database.clear_paragraph_corrections(chapter_id, paragraph_index)
     except Exception as e:
         raise HTTPException(status_code=500,
                             detail="Error: " + str(e) + " while saving paragraph. Try again later.")
 
+    if not found:
+        raise HTTPException(status_code=404, detail="Paragraph not found")
+
+
+class ParagraphTextRequest(BaseModel):
+    correctedText: Optional[str] = None
+
 
 @app.post("/api/chapters/{chapter_id}/paragraphs/{paragraph_index}/saveManual")
-async def paragraph_save_manual(chapter_id: int, paragraph_index: int, request: Dict):
+async def paragraph_save_manual(chapter_id: int, paragraph_index: int, request: ParagraphTextRequest):
     """
     Saves a manual edit for a paragraph (or clears it if it is the same as the AI)
     """
@@ -398,7 +639,7 @@ async def paragraph_save_manual(chapter_id: int, paragraph_index: int, request:
     if not paragraph:
         raise HTTPException(status_code=404, detail="Paragraph not found")
 
-    text: str | None = request.get("correctedText", None)
+    text = request.correctedText
 
     if text is not None and len(text) < 1:
         text = None
@@ -419,11 +660,11 @@ async def paragraph_save_manual(chapter_id: int, paragraph_index: int, request:
 
 
 @app.post("/api/chapters/{chapter_id}/paragraphs/{paragraph_index}/approve")
-async def paragraph_approve(chapter_id: int, paragraph_index: int, request: Dict):
+async def paragraph_approve(chapter_id: int, paragraph_index: int, request: ParagraphTextRequest):
     """
     Approves a paragraph and optionally saves a manual edit for it
     """
-    text: str | None = request.get("correctedText", None)
+    text = request.correctedText
 
     if text is not None and len(text) < 1:
         text = None
@@ -453,18 +694,15 @@ async def paragraph_reject(chapter_id: int, paragraph_index: int):
     """
     Rejects a paragraph
     """
-    paragraph = await database.get_paragraph(chapter_id, paragraph_index)
-    if not paragraph:
-        raise HTTPException(status_code=404, detail="Paragraph not found")
-
-    paragraph.correctionStatus = CorrectionStatus.rejected
-
     try:
-        await database.update_paragraph(paragraph)
+        found = await database.update_paragraph_status(chapter_id, paragraph_index, CorrectionStatus.rejected)
     except Exception as e:
         raise HTTPException(status_code=500,
                             detail="Error: " + str(e) + " while saving paragraph. Try again later.")
 
+    if not found:
+        raise HTTPException(status_code=404, detail="Paragraph not found")
+
 
 ##########
 # Zen mode
@@ -504,36 +742,20 @@ async def redirect_to_zen(chapter_id: int):
 
 @app.get("/api/zen/nextParagraph/{chapter_id}")
 async def get_next_paragraph(chapter_id: int, current: int, reverse: bool = False):
-    # TODO: could probably make the database fetch much more efficient here
     try:
-        corrections = await database.get_paragraphs_ids_needing_actions(chapter_id)
+        next_index = await database.get_next_paragraph_needing_action(chapter_id, current, reverse)
     except Exception as e:
         raise HTTPException(status_code=500,
                             detail="Error: " + str(e) + " while getting paragraphs with corrections.")
 
-    if len(corrections) == 0:
+    if next_index is None:
         return {"error": "Nothing more to correct"}
 
-    if reverse:
-        last_seen = None
-        for index in corrections:
-            if index < current:
-                last_seen = index
-
-        if last_seen is not None:
-            return {"next": last_seen}
-        else:
-            return {"next": corrections[0]}
-    else:
-        for index in corrections:
-            if index > current:
-                return {"next": index}
-
-        return {"next": corrections[len(corrections) - 1]}
+    return {"next": next_index}
 
 
 @app.get("/api/zen/load/{chapter_id}")
-async def get_zen_paragraphs(chapter_id: int, current: int):
+async def get_zen_paragraphs(chapter_id: int, current: int) -> List[Paragraph]:
     # Load the current and nearby paragraphs for correction display in the zen view
     try:
         return await database.get_paragraphs_around(chapter_id, current)
@@ -547,47 +769,41 @@ async def get_zen_paragraphs(chapter_id: int, current: int):
 #######################
 @app.get("/api/export/project/{project_id}/{name}", response_class=PlainTextResponse)
 async def export_corrections(project_id: int, name: str, mode: str = "correctionsWithOriginal"):
-    try:
-        parsed_mode = parse_mode(mode)
-    except:
+    parsed_mode = parse_mode(mode)
+    if parsed_mode is None:
         raise HTTPException(status_code=400, detail="Invalid mode")
 
     _, name_extension = os.path.splitext(name)
 
-    project = await database.get_project(project_id)
+    project = await database.get_project(project_id, include_paragraphs=True)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
     if name_extension == ".txt":
-        text = ""
+        chapter_texts = []
         for chapter in project.chapters:
-            if len(text) > 0:
-                text += "\n\n"
-
-            text += f"# Chapter {chapter.chapterIndex} of {len(project.chapters)} - {chapter.name}:\n\n"
+            chapter_texts.append(f"# Chapter {chapter.chapterIndex} of {len(project.chapters)} - {chapter.name}:\n\n" +
+                                 await format_chapter_corrections_as_text(chapter, parsed_mode))
 
-            text += await format_chapter_corrections_as_text(chapter, parsed_mode, database)
-
-        return text
+        return "\n\n".join(chapter_texts)
     else:
         raise HTTPException(status_code=415, detail="Unsupported file type to export")
 
 
 @app.get("/api/export/chapter/{chapter_id}/{name}", response_class=PlainTextResponse)
 async def export_chapter_corrections(chapter_id: int, name: str, mode: str = "correctionsWithOriginal"):
-    try:
-        parsed_mode = parse_mode(mode)
-    except:
+    parsed_mode = parse_mode(mode)
+    if parsed_mode is None:
         raise HTTPException(status_code=400, detail="Invalid mode")
 
     _, name_extension = os.path.splitext(name)
 
-    chapter = await database.get_chapter(chapter_id)
+    chapter = await database.get_chapter(chapter_id, include_paragraphs=True)
     if not chapter:
         raise HTTPException(status_code=404, detail="Chapter not found")
 
     if name_extension == ".txt":
-        return await format_chapter_corrections_as_text(chapter, parsed_mode, database)
+        return await format_chapter_corrections_as_text(chapter, parsed_mode)
     else:
         raise HTTPException(status_code=415, detail="Unsupported file type to export")
 
@@ -596,47 +812,53 @@ async def export_chapter_corrections(chapter_id: int, name: str, mode: str = "co
 # General AI endpoints
 ######################
 @app.get("/api/ai/models")
-async def get_models():
+async def list_models():
     try:
-        return await asyncio.to_thread(OllamaClient().list_available_models)
+        return await cached_ollama_info("models", OLLAMA_MODELS_CACHE_TIME, ollama_client.list_available_models)
     except Exception as e:
         return {"error": str(e)}
 
 
 @app.get("/api/ai/loaded")
-async def get_models():
-    return await asyncio.to_thread(OllamaClient().list_loaded)
+async def list_loaded_models():
+    return await cached_ollama_info("loaded", OLLAMA_LOADED_CACHE_TIME, ollama_client.list_loaded,
+                                    lambda result: "error" in result)
 
 
 @app.get("/api/ai/ollamaVersion")
-async def get_models():
-    return await asyncio.to_thread(OllamaClient().get_version)
-
+async def get_ollama_version():
+    return await cached_ollama_info("version", OLLAMA_VERSION_CACHE_TIME, ollama_client.get_version,
+                                    lambda result: result == "Error retrieving version")
 
-@app.post("/api/ai/chat/single")
-async def get_models(prompt: Dict):
-    if "prompt" not in prompt or type(prompt["prompt"]) is not str:
-        return {"error": "prompt required as JSON parameter"}
 
-    remove_think = True
+class ChatRequest(BaseModel):
+    prompt: str
+    removeThink: bool = True
 
-    if "removeThink" in prompt and prompt["removeThink"] == False:
-        remove_think = False
 
-    response = await (await get_ai_manager()).prompt_chat(prompt["prompt"], remove_think)
+@app.post("/api/ai/chat/single")
+async def chat_single(request: ChatRequest):
+    response = await (await get_ai_manager()).prompt_chat(request.prompt, request.removeThink)
 
     return {"response": response}
 
 
 @app.post("/api/ai/downloadRecommended")
-async def get_models():
+async def download_recommended():
     global downloaded_recommended
     if downloaded_recommended:
         return {"error": "recommended models already downloaded"}
+
+    # Set before awaiting anything so that concurrent requests can't also get past the check above
     downloaded_recommended = True
 
     print("Starting download of recommended models... This may take a while. Please wait.")
-    (await get_ai_manager()).download_recommended()
+    try:
+        (await get_ai_manager()).download_recommended()
+    except Exception:
+        # Allow retrying if the download couldn't even be queued
+        downloaded_recommended = False
+        raise
 
     return {"message": "recommended models download started"}
 
@@ -645,7 +867,7 @@ async def get_models():
 # Config management
 ###################
 @app.get("/api/config")
-async def get_config():
+async def get_config() -> ConfigModel:
     return await database.get_config()
 
 
@@ -672,19 +894,60 @@ async def update_config(new_config: ConfigModel):
 #################################
 # Support for static file serving
 #################################
-@app.get("/{path:path}")
-async def serve_other_files(path: str):
-    file_path = os.path.join(frontend_build_path, path)
-    with_html_extension = file_path + ".html"
-
-    if os.path.exists(file_path):
-        return FileResponse(file_path)
-    elif os.path.exists(with_html_extension):
-        # Need to serve specific html subpages so that routing works
-        return FileResponse(with_html_extension)
-    elif os.path.exists(os.path.join(file_path, "index.html")):
-        # Serving index files for each folder
-        return FileResponse(os.path.join(file_path, "index.html"))
-    else:
-        # Serve index.html for SPA fallback routing
-        return FileResponse(os.path.join(frontend_build_path, "index.html"))
+class FrontendStaticFiles(StaticFiles):
+    """
+    Serves the exported frontend. Next.js exports subpages as "<name>.html" and folders can have index.html files, so
+    those are tried when the exact path doesn't exist. Anything else gets the root index page for SPA fallback routing.
+
+    The build folder is indexed once on startup so requests don't need any filesystem lookups. Like the in-memory
+    index page, this means a rebuilt frontend needs a backend restart.
+    """
+
+    def __init__(self, directory: str):
+        super().__init__(directory=directory)
+        self.files = self._index_files(directory)
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            raise StarletteHTTPException(status_code=405)
+
+        file = self.files.get(path.replace(os.sep, "/"))
+
+        if file is not None:
+            return self.file_response(file[0], file[1], scope)
+
+        return index_response(Headers(scope=scope))
+
+    @staticmethod
+    def _index_files(directory: str) -> Dict[str, tuple[str, os.stat_result]]:
+        """
+        Maps request paths (as normalized by StaticFiles.get_path) to files and their stat results. Exact file names
+        take precedence over "<name>.html" files, which take precedence over "<name>/index.html" files.
+        """
+        files: Dict[str, tuple[str, os.stat_result]] = {}
+
+        for root, _, names in os.walk(directory):
+            for name in names:
+                full_path = os.path.join(root, name)
+                stat_result = os.stat(full_path)
+
+                if stat.S_ISREG(stat_result.st_mode):
+                    files[os.path.relpath(full_path, directory).replace(os.sep, "/")] = (full_path, stat_result)
+
+        html_files = [(path, file) for path, file in files.items() if path.endswith(".html")]
+
+        for path, file in html_files:
+            files.setdefault(path.removesuffix(".html"), file)
+
+        for path, file in html_files:
+            if path == "index.html":
+                files.setdefault(".", file)
+            elif path.endswith("/index.html"):
+                files.setdefault(path.removesuffix("/index.html"), file)
+
+        return files
+
+
+# Mounted last so that all the routes above take precedence. Only files found in the build folder on startup are
+# served and StaticFiles handles conditional requests, so unchanged files are answered with 304 responses.
+app.mount("/", FrontendStaticFiles(directory=frontend_build_path), name="frontend")
@@ -1,70 +1,77 @@
+import asyncio
 from enum import Enum
+from typing import List, Optional
 
 from difflib import SequenceMatcher
 
-from backend.db.database import Database
-from backend.db.project import Chapter, CorrectionStatus
+from backend.db.database import NO_ACTION_NEEDED_STATUSES
+from backend.db.project import Chapter, CorrectionStatus, Paragraph
 
 
 class ExportMode(int, Enum):
     correctionsWithOriginal = 0
 
 
-async def format_chapter_corrections_as_text(chapter: Chapter, mode: ExportMode, database: Database) -> str:
-    unhandled = await database.get_paragraphs_ids_needing_actions(chapter.id)
+async def format_chapter_corrections_as_text(chapter: Chapter, mode: ExportMode) -> str:
+    # The chapter must have been fetched with its paragraphs, they are not loaded again here
 
-    chapter_data = await database.get_chapter(chapter.id, include_paragraphs=True)
-    paragraphs = chapter_data.paragraphs
+    # Diffing all the corrections takes a while for big chapters, so that is done in a thread to not block other
+    # requests
+    return await asyncio.to_thread(format_paragraph_corrections_as_text, chapter.paragraphs, mode)
 
-    text = ""
 
-    if len(unhandled) > 0:
-        text += f"This chapter has {len(unhandled)} paragraphs that need manual checking!\n\n"
-
-    corrections = 0
+def format_paragraph_corrections_as_text(paragraphs: List[Paragraph], mode: ExportMode) -> str:
+    # Sort the paragraphs in one go, only the accepted ones are included in the export
+    accepted = []
+    unhandled = 0
 
     for paragraph in paragraphs:
         if paragraph.correctionStatus == CorrectionStatus.accepted:
-            corrections += 1
+            accepted.append(paragraph)
+        elif paragraph.correctionStatus not in NO_ACTION_NEEDED_STATUSES:
+            unhandled += 1
 
-    text += f"Listing {corrections} paragraph(s) that have corrections.\n"
+    # Collected as parts and joined at the end, as a project export can be a lot of text
+    parts = []
 
-    for paragraph in paragraphs:
-        if paragraph.correctionStatus != CorrectionStatus.accepted:
-            continue
+    if unhandled > 0:
+        parts.append(f"This chapter has {unhandled} paragraphs that need manual checking!\n\n")
+
+    parts.append(f"Listing {len(accepted)} paragraph(s) that have corrections.\n")
 
-        text += "\n"
+    for paragraph in accepted:
+        parts.append("\n")
 
         if paragraph.leadingSpace > 0:
-            text += "\n" * paragraph.leadingSpace
+            parts.append("\n" * paragraph.leadingSpace)
 
-        text += f"Paragraph {paragraph.index}:\n"
+        parts.append(f"Paragraph {paragraph.index}:\n")
 
         if mode == ExportMode.correctionsWithOriginal:
             # Extra space is added here so that the original text will line up
-            text += f"Original  : {paragraph.originalText}\n"
+            parts.append(f"Original  : {paragraph.originalText}\n")
 
             if paragraph.manuallyCorrectedText:
-                text += f"Correction: {paragraph.manuallyCorrectedText}\n"
+                parts.append(f"Correction: {paragraph.manuallyCorrectedText}\n")
             else:
-                text += f"Correction: {paragraph.correctedText}\n"
+                parts.append(f"Correction: {paragraph.correctedText}\n")
 
-            text += f"\nCorrection highlighted:\n"
+            parts.append(f"\nCorrection highlighted:\n")
 
             try:
                 if paragraph.manuallyCorrectedText:
-                    text += highlight_diff(paragraph.originalText, paragraph.manuallyCorrectedText)
+                    parts.append(highlight_diff(paragraph.originalText, paragraph.manuallyCorrectedText))
                 else:
-                    text += highlight_diff(paragraph.originalText, paragraph.correctedText)
+                    parts.append(highlight_diff(paragraph.originalText, paragraph.correctedText))
             except Exception as e:
-                text += f"## Error highlighting diff: {e}"
+                parts.append(f"## Error highlighting diff: {e}")
                 print(f"Error highlighting diff: {e}")
 
-            text += "\n---\n"
+            parts.append("\n---\n")
         else:
             raise Exception("Invalid export mode")
 
-    return text
+    return "".join(parts)
 
 
 def highlight_diff(original: str, updated: str) -> str:
@@ -79,18 +86,29 @@ def highlight_diff(original: str, updated: str) -> str:
     matcher = SequenceMatcher(None, original, updated)
     highlighted = []
 
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    for tag, _, _, j1, j2 in matcher.get_opcodes():
         if tag == 'equal':  # If the segments are equal, just add them
             highlighted.append(updated[j1:j2])
-        elif tag in {'replace', 'insert', 'delete'}:  # Highlight differences
-            highlighted.append(f"*{updated[j1:j2]}*")
+        else:  # Highlight differences (replace, insert or delete)
+            highlighted.append("*")
+
+            # Deletes have nothing in the updated text, so only the marker pair is added for them
+            if j1 != j2:
+                highlighted.append(updated[j1:j2])
+
+            highlighted.append("*")
 
     # Combine all the highlighted segments into a single string
     return ''.join(highlighted)
 
 
-def parse_mode(mode: str) -> ExportMode:
-    if mode == "correctionsWithOriginal":
-        return ExportMode.correctionsWithOriginal
-    else:
-        raise Exception("Invalid export mode")
+EXPORT_MODES = {
+    "correctionsWithOriginal": ExportMode.correctionsWithOriginal,
+}
+
+
+def parse_mode(mode: str) -> Optional[ExportMode]:
+    """
+    :return: The export mode matching the name or None if the mode is not valid
+    """
+    return EXPORT_MODES.get(mode)
@@ -1,5 +1,5 @@
 from typing import List
-from Levenshtein import distance as levenshtein_distance
+from rapidfuzz.distance.Levenshtein import distance as levenshtein_distance
 
 DEFAULT_THRESHOLD = 0.6
 
@@ -29,23 +29,25 @@ def validate_corrections(original: List[str], corrections: List[str], threshold:
     distance_values = []
 
     for i, (orig, corr) in enumerate(zip(original, corrections)):
-        # Compute the Levenshtein distance between the original and the corrected paragraph
-        dist = levenshtein_distance(orig, corr)
-
-        # Calculate relative distance (distance as a proportion of the original paragraph's length)
-        if len(orig) > 0:
-            relative_dist = dist / len(orig)
-        else:
+        if len(orig) == 0:
             # TODO: maybe allow empty correction?
             return False  # If original paragraph is empty, reject any correction
 
-        distance_values.append(relative_dist)
+        if all_must_pass:
+            # Only need to know if the distance goes over the allowed amount, which lets the calculation stop early.
+            # When it does, the returned distance is cutoff + 1.
+            cutoff = int(len(orig) * threshold)
+            dist = levenshtein_distance(orig, corr, score_cutoff=cutoff)
 
-        # Check if the relative distance exceeds the allowed threshold
-        if all_must_pass and relative_dist > threshold:
-            print(
-                f"Correction at index {i} is invalid: {relative_dist * 100:.2f}% change (allowed: {threshold * 100:.2f}%)")
-            return False  # Reject if the correction deviates too much from the original
+            if dist > cutoff:
+                print(f"Correction at index {i} is invalid: over {threshold * 100:.2f}% change")
+                return False  # Reject if the correction deviates too much from the original
+        else:
+            # Compute the Levenshtein distance between the original and the corrected paragraph
+            dist = levenshtein_distance(orig, corr)
+
+        # Calculate relative distance (distance as a proportion of the original paragraph's length)
+        distance_values.append(dist / len(orig))
 
     average = sum(distance_values) / len(original)
     if average > threshold:
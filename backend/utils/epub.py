@@ -1,18 +1,34 @@
 import zipfile
+from dataclasses import dataclass
 from typing import IO, List, Dict
 import re
 
-from bs4 import BeautifulSoup
-from pydantic import BaseModel
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
 
 
-class Paragraph(BaseModel):
+# Only the body of chapter documents is used, so the parser doesn't need to build the rest of the tree
+BODY_ONLY = SoupStrainer('body')
+
+# Chapters and paragraphs that are not part of the actual text. Checked with a regex instead of lower() and
+# startswith() to avoid making a lowercase copy of every paragraph.
+SKIPPED_CHAPTER = re.compile(r'(?:preface|afterword)$|(?:note|remark|skip|footer):', re.IGNORECASE)
+SKIPPED_PARAGRAPH = re.compile(r'(?:note:|remark:|skip:|footer:|chapter notes)', re.IGNORECASE)
+
+# Text that may have extra spaces from the separator used in extraction. Only these need the paragraph HTML checked.
+SEPARATOR_FIXES_NEEDED = re.compile(r'“ |” | ”| \?| \.| \( | \) ')
+
+
+# Plain slotted dataclasses, as a book has a lot of paragraphs and the extracted data doesn't need validation
+@dataclass(slots=True)
+class Paragraph:
     text: str
     index: int
     leadingSpace: int = 0
 
 
-class Chapter(BaseModel):
+@dataclass(slots=True)
+class Chapter:
     title: str
     paragraphs: List[Paragraph]
 
@@ -35,150 +51,138 @@ def extract_epub_chapters(file_content: IO[bytes], use_span_squash=False) -> Lis
 
     # Use a zipfile to read the EPUB content
     with (zipfile.ZipFile(file_content) as epub_zip):
-        # Locate the container file
-        with epub_zip.open('META-INF/container.xml') as container_file:
-            container_soup = BeautifulSoup(container_file, 'xml')
-            rootfile_path = container_soup.find('rootfile')['full-path']
-
         # Extract TOC to know what chapters we should look at (spine has stuff we don't necessarily want)
         valid_chapters = extract_epub_toc(epub_zip)
 
-        # Open the rootfile (OPF file) to find the spine and chapters
-        with epub_zip.open(rootfile_path) as opf_file:
-            opf_soup = BeautifulSoup(opf_file, 'xml')
-
-            # Iterate through the valid chapters
-            for chapter in valid_chapters:
-                chapter_title = chapter['title']
-
-                # Skip unwanted chapters
-                title_lower = chapter_title.lower()
-                if title_lower == "preface" or title_lower == "afterword":
-                    continue
-
-                if chapter_title.lower().startswith(('note:', 'remark:', 'skip:', 'footer:')):
-                    continue
-
-                chapter_path = chapter['href']
-
-                # Extract the chapter content
-                with epub_zip.open(chapter_path) as chapter_file:
-                    chapter_soup = BeautifulSoup(chapter_file, 'html.parser')
-
-                    # Skip irrelevant remarks or metadata (headers, footers)
-                    body = chapter_soup.find('body')
-                    if not body:
-                        continue  # If no <body> tag is found, move to the next chapter
-
-                    paragraph_result = []
-                    paragraph_counter = 1
-
-                    # Body text extraction
-                    paragraphs = body.find_all('p')  # Get paragraphs (<p> tags)
-
+        # Iterate through the valid chapters
+        for chapter in valid_chapters:
+            chapter_title = chapter['title']
+
+            # Skip unwanted chapters
+            if SKIPPED_CHAPTER.match(chapter_title):
+                continue
+
+            chapter_path = chapter['href']
+
+            # Extract the chapter content
+            with epub_zip.open(chapter_path) as chapter_file:
+                chapter_soup = BeautifulSoup(chapter_file, 'html.parser', parse_only=BODY_ONLY)
+
+                # Skip irrelevant remarks or metadata (headers, footers)
+                body = chapter_soup.find('body')
+                if not body:
+                    continue  # If no <body> tag is found, move to the next chapter
+
+                paragraph_result = []
+                paragraph_counter = 1
+
+                # Body text extraction
+                paragraphs = body.find_all('p')  # Get paragraphs (<p> tags)
+
+                leading_space = 0
+
+                for paragraph in paragraphs:
+
+                    extended_extraction = False
+
+                    # It seems like spans spammed everywhere make the text very unclean so we need to fix that
+                    # by squashing stuff when it is detected. Though it is extremely hard to know when the spans
+                    # would actually help being ignored. Might need a custom extraction after all if this needs
+                    # to be improved further.
+                    if use_span_squash and messy_spans.search(str(paragraph)):
+                        paragraph_text = paragraph.get_text(strip=True)
+                    else:
+                        # Need to extract with separators added as otherwise embedded emphasis sections are not
+                        # extracted correctly
+                        # noinspection PyArgumentList
+                        paragraph_text = paragraph.get_text(strip=True, separator=" ")
+                        extended_extraction = True
+
+                    # Ignore empty paragraphs or remarks
+                    skip = len(paragraph_text) == 0 or paragraph_text.isspace() or SKIPPED_PARAGRAPH.match(
+                        paragraph_text) is not None
+
+                    # Ignore notes in ao3 epubs
+                    if not skip and paragraph.parent.name == "blockquote" and "userstuff" in paragraph.parent.get(
+                            "class"):
+                        skip = True
+
+                    if skip:
+                        # Empty paragraphs add extra spacing between other paragraphs to make chapters look nicer
+                        if len(paragraph_result) > 0:
+                            leading_space = 1
+                        continue
+
+                    if extended_extraction:
+                        # TODO: put the following into a helper method
+
+                        # Try to deal with situations with a bunch of extra added line changes etc. that may be added
+                        # as an artifact of the " " separator use.
+                        # Note that this sadly masks mistakes with multiple spaces in a row, but hopefully we don't
+                        # need to try to find those.
+                        # Hopefully there are no paragraphs with embedded line breaks so this doesn't needto detect
+                        # what kind of whitespace is replaced
+                        paragraph_text = paragraph_extra_spaces.sub(' ', paragraph_text)
+
+                        # Turning the paragraph back into HTML is the slowest part of the extraction, so it is only
+                        # done when one of the fixes below can apply
+                        raw_html = str(paragraph) if SEPARATOR_FIXES_NEEDED.search(paragraph_text) else ""
+
+                        # Fixing special case mistakes
+                        # Quote that starts before an em section that is immediately in it
+                        if "“ " in paragraph_text:
+                            if "“<em" in raw_html:
+                                paragraph_text = paragraph_text.replace("“ ", "“", raw_html.count("“<em"))
+                            if "“<span>" in raw_html:
+                                paragraph_text = paragraph_text.replace("“ ", "“", raw_html.count("“<span>"))
+                            if "“</" in raw_html:
+                                paragraph_text = paragraph_text.replace("“ ", "“", raw_html.count("“</"))
+
+                        if "” " in paragraph_text:
+                            if "”</em>." in raw_html:
+                                paragraph_text = paragraph_text.replace("” ", "”", raw_html.count("”</em"))
+                            # if "”</span" in raw_html:
+                            #     paragraph_text = paragraph_text.replace(" ”", "”", raw_html.count("”</span"))
+
+                        if " ”" in paragraph_text:
+                            if "span>”" in raw_html:
+                                paragraph_text = paragraph_text.replace(" ”", "”", raw_html.count("span>”"))
+
+                        if " “ " in paragraph_text:
+                            if "“</" in raw_html:
+                                paragraph_text = paragraph_text.replace("“ ", "“", raw_html.count("“</"))
+
+                        if " ?" in paragraph_text or " ." in paragraph_text:
+                            if "span>?" in raw_html:
+                                paragraph_text = paragraph_text.replace(" ?", "?", raw_html.count("span>?"))
+                            if "span>." in raw_html:
+                                paragraph_text = paragraph_text.replace(" .", ".", raw_html.count("span>."))
+                            if ">?<" in raw_html:
+                                paragraph_text = paragraph_text.replace(" ?", "?", raw_html.count(">?<"))
+                            if ">?”" in raw_html:
+                                paragraph_text = paragraph_text.replace(" ?", "?", raw_html.count(">?”"))
+
+                        if " ( " in paragraph_text:
+                            if ">(" in raw_html or "(<" in raw_html:
+                                paragraph_text = paragraph_text.replace(" ( ", " (")
+                        if " ) " in paragraph_text:
+                            if ">)" in raw_html or ")<" in raw_html:
+                                paragraph_text = paragraph_text.replace(" ) ", ") ")
+
+                    paragraph_result.append(
+                        Paragraph(text=paragraph_text, index=paragraph_counter, leadingSpace=leading_space))
+                    paragraph_counter += 1
                     leading_space = 0
 
-                    for paragraph in paragraphs:
-
-                        raw_html = str(paragraph)
-                        extended_extraction = False
-
-                        # It seems like spans spammed everywhere make the text very unclean so we need to fix that
-                        # by squashing stuff when it is detected. Though it is extremely hard to know when the spans
-                        # would actually help being ignored. Might need a custom extraction after all if this needs
-                        # to be improved further.
-                        if use_span_squash and messy_spans.search(raw_html):
-                            paragraph_text = paragraph.get_text(strip=True)
-                        else:
-                            # Need to extract with separators added as otherwise embedded emphasis sections are not
-                            # extracted correctly
-                            # noinspection PyArgumentList
-                            paragraph_text = paragraph.get_text(strip=True, separator=" ")
-                            extended_extraction = True
-
-                        # Ignore empty paragraphs or remarks
-                        skip = (
-                                len(paragraph_text) == 0 or paragraph_text.isspace() or paragraph_text.lower().startswith(
-                            ('note:', 'remark:', 'skip:', 'footer:', "chapter notes"))
-                        )
-
-                        # Ignore notes in ao3 epubs
-                        if not skip and paragraph.parent.name == "blockquote" and "userstuff" in paragraph.parent.get(
-                                "class"):
-                            skip = True
-
-                        if skip:
-                            # Empty paragraphs add extra spacing between other paragraphs to make chapters look nicer
-                            if len(paragraph_result) > 0:
-                                leading_space = 1
-                            continue
-
-                        if extended_extraction:
-                            # TODO: put the following into a helper method and use a precompiled regex to detect if anything
-                            # needs to be done
-
-                            # Try to deal with situations with a bunch of extra added line changes etc. that may be added
-                            # as an artifact of the " " separator use.
-                            # Note that this sadly masks mistakes with multiple spaces in a row, but hopefully we don't
-                            # need to try to find those.
-                            # Hopefully there are no paragraphs with embedded line breaks so this doesn't needto detect
-                            # what kind of whitespace is replaced
-                            paragraph_text = paragraph_extra_spaces.sub(' ', paragraph_text)
-
-                            # Fixing special case mistakes
-                            # Quote that starts before an em section that is immediately in it
-                            if "“ " in paragraph_text:
-                                if "“<em" in raw_html:
-                                    paragraph_text = paragraph_text.replace("“ ", "“", raw_html.count("“<em"))
-                                if "“<span>" in raw_html:
-                                    paragraph_text = paragraph_text.replace("“ ", "“", raw_html.count("“<span>"))
-                                if "“</" in raw_html:
-                                    paragraph_text = paragraph_text.replace("“ ", "“", raw_html.count("“</"))
-
-                            if "” " in paragraph_text:
-                                if "”</em>." in raw_html:
-                                    paragraph_text = paragraph_text.replace("” ", "”", raw_html.count("”</em"))
-                                # if "”</span" in raw_html:
-                                #     paragraph_text = paragraph_text.replace(" ”", "”", raw_html.count("”</span"))
-
-                            if " ”" in paragraph_text:
-                                if "span>”" in raw_html:
-                                    paragraph_text = paragraph_text.replace(" ”", "”", raw_html.count("span>”"))
-
-                            if " “ " in paragraph_text:
-                                if "“</" in raw_html:
-                                    paragraph_text = paragraph_text.replace("“ ", "“", raw_html.count("“</"))
-
-                            if " ?" in paragraph_text or " ." in paragraph_text:
-                                if "span>?" in raw_html:
-                                    paragraph_text = paragraph_text.replace(" ?", "?", raw_html.count("span>?"))
-                                if "span>." in raw_html:
-                                    paragraph_text = paragraph_text.replace(" .", ".", raw_html.count("span>."))
-                                if ">?<" in raw_html:
-                                    paragraph_text = paragraph_text.replace(" ?", "?", raw_html.count(">?<"))
-                                if ">?”" in raw_html:
-                                    paragraph_text = paragraph_text.replace(" ?", "?", raw_html.count(">?”"))
-
-                            if " ( " in paragraph_text:
-                                if ">(" in raw_html or "(<" in raw_html:
-                                    paragraph_text = paragraph_text.replace(" ( ", " (")
-                            if " ) " in paragraph_text:
-                                if ">)" in raw_html or ")<" in raw_html:
-                                    paragraph_text = paragraph_text.replace(" ) ", ") ")
-
-                        paragraph_result.append(
-                            Paragraph(text=paragraph_text, index=paragraph_counter, leadingSpace=leading_space))
-                        paragraph_counter += 1
-                        leading_space = 0
-
-                    chapter = Chapter(title=chapter_title, paragraphs=paragraph_result)
-                    result.append(chapter)
+                chapter = Chapter(title=chapter_title, paragraphs=paragraph_result)
+                result.append(chapter)
 
     return result
 
 
 def chapters_to_plain_text(chapters: List[Chapter], char_limit: int):
-    extracted_text = ""
+    # Collected as parts and joined at the end as the whole book may be converted
+    parts = []
 
     current_char_count = 0
     chapter_counter = 0
@@ -194,10 +198,10 @@ def chapters_to_plain_text(chapters: List[Chapter], char_limit: int):
             title_with_separator = f"## {chapter_title}\n\n"
 
         # Spacing before chapter title
-        if len(extracted_text) > 0:
-            extracted_text += "\n"
+        if parts:
+            parts.append("\n")
 
-        extracted_text += title_with_separator
+        parts.append(title_with_separator)
         current_char_count += len(title_with_separator)
 
         for paragraph in chapter.paragraphs:
@@ -206,18 +210,34 @@ def chapters_to_plain_text(chapters: List[Chapter], char_limit: int):
             # TODO: maybe a mode where only full paragraphs are allowed to be cut?
             if current_char_count + len(paragraph.text) > char_limit:
                 remaining_chars = char_limit - current_char_count
-                extracted_text += paragraph.text[:remaining_chars]
-                return extracted_text  # Stop future processing at the limit
+                parts.append(paragraph.text[:remaining_chars])
+                return "".join(parts)  # Stop future processing at the limit
 
-            extracted_text += paragraph.text + "\n\n"  # Add double newline for paragraph break
+            parts.append(paragraph.text)
+            parts.append("\n\n")  # Add double newline for paragraph break
             current_char_count += len(paragraph.text)
 
-    return extracted_text
+    return "".join(parts)
 
 
 ## Internal helper functions
 
-def extract_epub_toc(epub_zip: zipfile) -> List[Dict[str, str]]:
+# The epub metadata files are well-formed XML, so they are read with lxml directly. Lookups use the {*} namespace
+# wildcard as the namespaces differ between epub versions.
+# Like BeautifulSoup, the parser recovers from small mistakes in the files instead of refusing the whole book.
+METADATA_PARSER = etree.XMLParser(recover=True, resolve_entities=False)
+
+def read_rootfile_path(epub_zip: zipfile.ZipFile) -> str:
+    """
+    Finds the path of the OPF file from the epub container file
+    """
+    with epub_zip.open('META-INF/container.xml') as container_file:
+        container = etree.parse(container_file, METADATA_PARSER)
+
+    return container.find('.//{*}rootfile').get('full-path')
+
+
+def extract_epub_toc(epub_zip: zipfile.ZipFile) -> List[Dict[str, str]]:
     """
     Extracts the Table of Contents (ToC) from an EPUB file that is already open as a zip
 
@@ -225,55 +245,50 @@ def extract_epub_toc(epub_zip: zipfile) -> List[Dict[str, str]]:
         List[Dict[str, str]]: A list of dictionaries, each representing a ToC entry with `title` and `href`.
     """
     # Step 1: Locate the container.xml file
-    with epub_zip.open('META-INF/container.xml') as container_file:
-        container_soup = BeautifulSoup(container_file, 'xml')
-        rootfile_path = container_soup.find('rootfile')['full-path']
+    rootfile_path = read_rootfile_path(epub_zip)
 
     # Step 2: Parse the OPF file to find the ToC file reference
     with epub_zip.open(rootfile_path) as opf_file:
-        opf_soup = BeautifulSoup(opf_file, 'xml')
-
-        # Get the manifest to find the ToC file (NCX or Nav)
-        manifest_items = {item['id']: item for item in opf_soup.find_all('item')}
-        spine = opf_soup.find('spine')
-
-        # Try to locate the NCX file first (For EPUB 2)
-        ncx_reference = [item['href'] for item in manifest_items.values() if
-                         item.get('media-type') == 'application/x-dtbncx+xml']
-
-        if ncx_reference:
-            ncx_path = ncx_reference[0]
-            with epub_zip.open(ncx_path) as ncx_file:
-                ncx_soup = BeautifulSoup(ncx_file, 'xml')
-                return extract_ncx_toc(ncx_soup)
-
-        # If there is no NCX file, fall back to EPUB 3 HTML navigation document
-        nav_item = [item for item in manifest_items.values() if
-                    item['media-type'] == 'application/xhtml+xml' and 'nav' in item['properties']]
-        if nav_item:
-            nav_href = nav_item[0]['href']
-            with epub_zip.open(nav_href) as nav_file:
-                nav_soup = BeautifulSoup(nav_file, 'html.parser')
-                return extract_nav_toc(nav_soup)
+        opf = etree.parse(opf_file, METADATA_PARSER)
+
+    # Get the manifest to find the ToC file (NCX or Nav)
+    manifest_items = list(opf.iter('{*}item'))
+
+    # Try to locate the NCX file first (For EPUB 2)
+    ncx_reference = [item.get('href') for item in manifest_items if
+                     item.get('media-type') == 'application/x-dtbncx+xml']
+
+    if ncx_reference:
+        ncx_path = ncx_reference[0]
+        with epub_zip.open(ncx_path) as ncx_file:
+            return extract_ncx_toc(etree.parse(ncx_file, METADATA_PARSER))
+
+    # If there is no NCX file, fall back to EPUB 3 HTML navigation document
+    nav_item = [item for item in manifest_items if
+                item.get('media-type') == 'application/xhtml+xml' and 'nav' in item.get('properties', '')]
+    if nav_item:
+        nav_href = nav_item[0].get('href')
+        with epub_zip.open(nav_href) as nav_file:
+            nav_soup = BeautifulSoup(nav_file, 'html.parser')
+            return extract_nav_toc(nav_soup)
 
     return []
 
 
-def extract_ncx_toc(ncx_soup: BeautifulSoup) -> List[Dict[str, str]]:
+def extract_ncx_toc(ncx: etree.ElementTree) -> List[Dict[str, str]]:
     """
     Extracts the ToC from an NCX file (EPUB 2).
     Args:
-        ncx_soup (BeautifulSoup): Parsed NCX contents.
+        ncx (etree.ElementTree): Parsed NCX contents.
 
     Returns:
         List[Dict[str, str]]: A list of ToC entries with `title` and `href`.
     """
     toc = []
-    nav_points = ncx_soup.find_all('navPoint')
-    for nav_point in nav_points:
+    for nav_point in ncx.iter('{*}navPoint'):
         # Extract ToC entry: text and corresponding reference (href)
-        title = nav_point.find('text').get_text(strip=True)
-        content = nav_point.find('content')['src']
+        title = "".join(nav_point.find('.//{*}text').itertext()).strip()
+        content = nav_point.find('.//{*}content').get('src')
         toc.append({'title': title, 'href': content})
     return toc
 
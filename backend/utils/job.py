@@ -1,6 +1,5 @@
 import asyncio
-from concurrent.futures import Future
-from typing import Callable, Any
+from typing import Callable, Any, Optional
 
 
 class Job:
@@ -9,16 +8,24 @@ class Job:
     Integrates with async contexts by using a Future for awaiting the job.
     """
 
-    def __init__(self, task: Callable[[], Any]):
+    def __init__(self, task: Callable[[], Any], loop: Optional[asyncio.AbstractEventLoop] = None):
         """
         Initializes a Job instance.
 
         Args:
             task (Callable): The function to be executed for this job.
                             Must be callable without arguments.
+            loop (AbstractEventLoop): The event loop the job is awaited from, defaults to the running loop.
         """
         self.task = task
-        self.future = Future()  # Future object represents an asynchronous result
+        self.loop = loop or asyncio.get_running_loop()
+
+        # Future object represents an asynchronous result. This is an asyncio future (instead of a thread one that
+        # would need wrapping) as jobs are always awaited from the loop they were created on.
+        self.future = self.loop.create_future()
+
+        # Some jobs are never awaited (like model downloads), their errors shouldn't be logged as never retrieved
+        self.future.add_done_callback(_consume_exception)
         self.success = None  # Indicates whether the job succeeded (True/False/None)
         self.error_message = None  # Stores an error message if an exception occurs
         self.return_value = None  # The result returned by the task
@@ -31,11 +38,11 @@ class Job:
         try:
             self.return_value = self.task()  # Execute the task and store the result
             self.success = True
-            self.future.set_result(self.return_value)  # Success: Set the result in the Future
+            self._complete(self._set_result, self.return_value)  # Success: Set the result in the Future
         except Exception as e:
             self.success = False
             self.error_message = str(e)
-            self.future.set_exception(e)  # Failure: Set the exception in the Future
+            self._complete(self._set_exception, e)  # Failure: Set the exception in the Future
         finally:
             self.pending = False  # Mark as not pending since the job is done
 
@@ -49,7 +56,7 @@ class Job:
         Raises:
             Exception: If the job failed, raises the original exception.
         """
-        return await asyncio.wrap_future(self.future)
+        return await self.future
 
     def __await__(self):
         """
@@ -57,6 +64,23 @@ class Job:
         """
         return self.wait().__await__()
 
+    def _complete(self, setter: Callable[[Any], None], value: Any):
+        # Jobs are run on the job queue thread, so the future needs to be resolved on its own loop
+        try:
+            self.loop.call_soon_threadsafe(setter, value)
+        except RuntimeError:
+            # The loop is already closed, so no one can be waiting for the result anymore
+            pass
+
+    def _set_result(self, value: Any):
+        # The waiter may have been cancelled in the meantime
+        if not self.future.done():
+            self.future.set_result(value)
+
+    def _set_exception(self, exception: BaseException):
+        if not self.future.done():
+            self.future.set_exception(exception)
+
     def __repr__(self):
         """
         Returns a string representation of the Job object.
@@ -70,3 +94,8 @@ class Job:
             return f"<Job success={self.success}, return_value={self.return_value}>"
         else:
             return f"<Job success={self.success}, error_message={self.error_message}>"
+
+
+def _consume_exception(future: asyncio.Future):
+    if not future.cancelled():
+        future.exception()
@@ -12,28 +12,28 @@ class JobQueue:
 
     def __init__(self):
         self.task_queue = queue.Queue()  # Thread-safe queue for tasks
-        self.lock = threading.Lock()  # Lock for thread-safe methods
         self.worker_thread = threading.Thread(target=self._worker, daemon=True)
-        self.shutdown_event = threading.Event()
         self.worker_thread.start()  # Start the daemon worker thread
 
     def _worker(self):
         """
         Worker method that continuously runs tasks from the queue.
-        Exits when the shutdown event is set.
+        Exits when it receives the shutdown sentinel (None).
         """
-        while not self.shutdown_event.is_set():
+        while True:
+            # Blocks until there is something to do, so the thread doesn't wake up at all while idle
+            task = self.task_queue.get()
+
+            if task is None:
+                self.task_queue.task_done()
+                break
+
             try:
-                # Wait for a task, timeout allows graceful shutdown
-                task = self.task_queue.get(timeout=0.1)
-                try:
-                    task.run()  # Execute the task
-                except Exception as e:
-                    print(f"Unexpected exception caused in task running: {e}")
-                finally:
-                    self.task_queue.task_done()  # Mark the task as done
-            except queue.Empty:
-                continue
+                task.run()  # Execute the task
+            except Exception as e:
+                print(f"Unexpected exception caused in task running: {e}")
+            finally:
+                self.task_queue.task_done()  # Mark the task as done
 
     def submit(self, task: Job):
         """
@@ -42,21 +42,22 @@ class JobQueue:
         Args:
             task (Job): A task to be executed by the worker thread.
         """
-        with self.lock:  # Ensure thread-safety when accessing the queue
-            self.task_queue.put(task)
+        # The queue itself is thread-safe, so no extra locking is needed
+        self.task_queue.put(task)
 
     def clear(self):
         """
         Clears all pending tasks in the job queue. Thread-safe.
         """
-        with self.lock:
-            # Clear the queue by repeatedly removing items
-            while not self.task_queue.empty():
-                try:
-                    self.task_queue.get_nowait()
-                    self.task_queue.task_done()  # Mark removed task as done
-                except queue.Empty:
-                    break
+        # The queue is thread-safe on its own, so the pending tasks can be removed one by one without extra locking.
+        # The currently running task (if any) is marked as done by the worker when it finishes.
+        while True:
+            try:
+                self.task_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            self.task_queue.task_done()  # Mark removed task as done
 
     def wait_for_completion(self):
         """
@@ -67,6 +68,7 @@ class JobQueue:
     def shutdown(self):
         """
         Gracefully shuts down the job queue by stopping the background thread.
+        Tasks submitted before this are still run first.
         """
-        self.shutdown_event.set()  # Signal the worker thread to exit
+        self.task_queue.put(None)  # Signal the worker thread to exit
         self.worker_thread.join()  # Wait for the worker thread to terminate